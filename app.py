@@ -1,40 +1,92 @@
+import argparse
+import collections
+import csv
+import itertools
 import json
 import os
+import queue
+import sys
+import time
 from curl_cffi import requests as curl_requests
-import matplotlib # Required by nltk to load runtime worfreqs DONT DELETE
-import nltk
-nltk.download('vader_lexicon')
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import webbrowser
 import tkinter as tk
 from tkinter import scrolledtext, ttk, PhotoImage, messagebox
 import base64
+import bisect
+import codecs
 import re
+import random
+import functools
+import hashlib
+import heapq
+import sqlite3
+import tempfile
+import threading
+import multiprocessing
+import shutil
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from io import BytesIO
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
 from http import HTTPStatus  
-try:
-    import docx
-except ImportError:
-    docx = None
-try:
-    import PyPDF2
-except ImportError:
-    PyPDF2 = None
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
 
 os.environ['REQUESTS_CA_BUNDLE'] = 'cacert.pem'
 
 #FALLBACK DEFAULTS if congif.json not found
 GOOGLE_SEARCH_API_KEY = None
 GOOGLE_SEARCH_CX = None
+GOOGLE_SEARCH_API_URL = 'https://www.googleapis.com/customsearch/v1'
 TOTAL_RESULTS = 10
+SEARCH_PAGE_WORKERS = 3
+MAX_SEARCH_REQUESTS = 10
 PDF_MAX_PAGES = 5
 DOCX_MAX_PARAGRAPHS = 50
 MAX_CHARS = 5000
 CONNECT_TIMEOUT = 5 
 READ_TIMEOUT = 10
 MAX_RETRIES = 3
+FETCH_MAX_WORKERS = 8
+FETCH_PER_HOST_LIMIT = 2
+SCORING_PROCESSES = 0
+SCORING_MODE = 'document'
+SENTENCE_AGGREGATION = 'max'
+SENTENCE_TOP_K = 3
+KEYWORD_PREFILTER = 'any'
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = 60
 CURL_CFFI_IMPERSONATOR = "chrome"  # Options: chrome, safari, safari_ios
 NAME_MIN_LENGTH = 3
+MAX_DOWNLOAD_MB = 20
+DOCUMENT_SPOOL_MB = 2
+CACHE_ENABLED = True
+CACHE_PATH = 'cache.sqlite3'
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_MB = 200
+INCREMENTAL_SCREENING = True
+RESULTS_STORE_PATH = 'results.sqlite3'
+REPORT_PATH = 'report.jsonl'
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8080
+SERVICE_WORKERS = 2
+SERVICE_QUEUE_SIZE = 20
+SERVICE_REQUEST_TIMEOUT = 300
+METRICS_ENABLED = True
+METRICS_JSON_PATH = 'metrics.json'
+METRICS_PROMETHEUS_PATH = 'metrics.prom'
+
+
+def _config_warning(title, message):
+    # Headless (batch) runs have no display to show a dialog on
+    try:
+        messagebox.showwarning(title, message)
+    except tk.TclError:
+        print(f"{title}: {message}", file=sys.stderr)
+
 
 # Load configuration
 try:
@@ -46,10 +98,17 @@ try:
         
         # GET CX (https://cse.google.com/all OR https://programmablesearchengine.google.com/controlpanel/all)
         GOOGLE_SEARCH_CX = config.get('google_search_cx', GOOGLE_SEARCH_CX)
+
+        # Custom Search endpoint, only overridden to point at a mock server (see bench_pipeline.py)
+        GOOGLE_SEARCH_API_URL = config.get('google_search_api_url', GOOGLE_SEARCH_API_URL)
         
         #Total number of google search results to fetch
         TOTAL_RESULTS = config.get('total_results', TOTAL_RESULTS)
 
+        # Result pages (10 results each) requested in parallel, and max billed search requests per screening
+        SEARCH_PAGE_WORKERS = config.get('search_page_workers', SEARCH_PAGE_WORKERS)
+        MAX_SEARCH_REQUESTS = config.get('max_search_requests', MAX_SEARCH_REQUESTS)
+
         # Maximum number of pages to read from PDF
         PDF_MAX_PAGES = config.get('pdf_max_pages', PDF_MAX_PAGES)
 
@@ -59,10 +118,35 @@ try:
         # Maximum number of characters to read from text
         MAX_CHARS = config.get('max_chars', MAX_CHARS)
 
+        # Download ceiling per link, and size above which PDF/DOCX downloads are spooled to a temp file
+        MAX_DOWNLOAD_MB = config.get('max_download_mb', MAX_DOWNLOAD_MB)
+        DOCUMENT_SPOOL_MB = config.get('document_spool_mb', DOCUMENT_SPOOL_MB)
+
         #Connection settings
         CONNECT_TIMEOUT = config.get('connection_timeout', CONNECT_TIMEOUT)
         READ_TIMEOUT = config.get('read_timeout', READ_TIMEOUT)
         MAX_RETRIES = config.get('max_retries', MAX_RETRIES)
+
+        # Concurrent link fetching: total worker threads and max parallel requests per host
+        FETCH_MAX_WORKERS = config.get('fetch_max_workers', FETCH_MAX_WORKERS)
+        FETCH_PER_HOST_LIMIT = config.get('fetch_per_host_limit', FETCH_PER_HOST_LIMIT)
+
+        # Worker processes for PDF/DOCX extraction and sentiment scoring (0 = score on the fetch threads)
+        SCORING_PROCESSES = config.get('scoring_processes', SCORING_PROCESSES)
+
+        # Score whole documents, or sentences combined by max, top_k_mean or keyword_proximity
+        SCORING_MODE = config.get('scoring_mode', SCORING_MODE)
+        SENTENCE_AGGREGATION = config.get('sentence_aggregation', SENTENCE_AGGREGATION)
+        SENTENCE_TOP_K = config.get('sentence_top_k', SENTENCE_TOP_K)
+
+        # Documents must mention: any (the customer or a keyword), name, name_and_keyword, or off to score everything
+        KEYWORD_PREFILTER = config.get('keyword_prefilter', KEYWORD_PREFILTER)
+
+        # Retries: exponential backoff (seconds) with jitter, and per-host circuit breaking after repeated failures
+        RETRY_BACKOFF_BASE = config.get('retry_backoff_base', RETRY_BACKOFF_BASE)
+        RETRY_BACKOFF_MAX = config.get('retry_backoff_max', RETRY_BACKOFF_MAX)
+        CIRCUIT_BREAKER_THRESHOLD = config.get('circuit_breaker_threshold', CIRCUIT_BREAKER_THRESHOLD)
+        CIRCUIT_BREAKER_COOLDOWN = config.get('circuit_breaker_cooldown', CIRCUIT_BREAKER_COOLDOWN)
         
         #Curl Browser impersonators: chrome, safari and safari_ios
         CURL_CFFI_IMPERSONATOR = config.get('curl_cffi_impersonator', CURL_CFFI_IMPERSONATOR) 
@@ -70,10 +154,82 @@ try:
         # Minimum length of customer name input
         NAME_MIN_LENGTH = config.get('name_min_length', NAME_MIN_LENGTH)
 
+        # On-disk cache of search API responses and fetched documents
+        CACHE_ENABLED = config.get('cache_enabled', CACHE_ENABLED)
+        CACHE_PATH = config.get('cache_path', CACHE_PATH)
+        CACHE_TTL_SECONDS = config.get('cache_ttl_seconds', CACHE_TTL_SECONDS)
+        CACHE_MAX_MB = config.get('cache_max_mb', CACHE_MAX_MB)
+
+        # Past results per customer and link: re-screens send conditional GETs and only report new or changed links
+        INCREMENTAL_SCREENING = config.get('incremental_screening', INCREMENTAL_SCREENING)
+        RESULTS_STORE_PATH = config.get('results_store_path', RESULTS_STORE_PATH)
+
+        # Per-link report every screening appends to (JSONL, or CSV for a .csv path; empty to disable)
+        REPORT_PATH = config.get('report_path', REPORT_PATH)
+
+        # HTTP screening service (--serve): concurrent screenings, queued requests before 503s, and wait per request
+        SERVICE_HOST = config.get('service_host', SERVICE_HOST)
+        SERVICE_PORT = config.get('service_port', SERVICE_PORT)
+        SERVICE_WORKERS = config.get('service_workers', SERVICE_WORKERS)
+        SERVICE_QUEUE_SIZE = config.get('service_queue_size', SERVICE_QUEUE_SIZE)
+        SERVICE_REQUEST_TIMEOUT = config.get('service_request_timeout', SERVICE_REQUEST_TIMEOUT)
+
+        # Per-stage timings and counters, exported as JSON and Prometheus text after each screening
+        METRICS_ENABLED = config.get('metrics_enabled', METRICS_ENABLED)
+        METRICS_JSON_PATH = config.get('metrics_json_path', METRICS_JSON_PATH)
+        METRICS_PROMETHEUS_PATH = config.get('metrics_prometheus_path', METRICS_PROMETHEUS_PATH)
+
 except FileNotFoundError:
-    messagebox.showwarning("Configuration Error", "Config file not found. Using Predefined  Defaults. Please create a config.json file in program root directory.")
+    _config_warning("Configuration Error", "Config file not found. Using Predefined  Defaults. Please create a config.json file in program root directory.")
 except KeyError as e:
-    messagebox.showwarning("Configuration Error", f"Missing configuration key in config.json: {e}")
+    _config_warning("Configuration Error", f"Missing configuration key in config.json: {e}")
+
+
+def _app_dir():
+    # Directory holding the executable when packaged with PyInstaller, else this file's directory
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+# nltk data shipped with the app (bundled by app.spec) or downloaded next to it on first run
+NLTK_DATA_DIR = os.path.join(_app_dir(), 'nltk_data')
+
+# The optional document parsers are imported the first time they are needed, with plain
+# import statements so PyInstaller's analysis still bundles them (see also app.spec)
+
+def _import_pypdf2():
+    try:
+        import PyPDF2
+    except ImportError:
+        return None
+    return PyPDF2
+
+
+def _import_docx():
+    try:
+        import docx
+    except ImportError:
+        return None
+    return docx
+
+
+def _ensure_vader_lexicon():
+    """
+    Make the VADER lexicon available to nltk, downloading it only if no local copy exists.
+    """
+    import nltk
+
+    for data_dir in (os.path.join(getattr(sys, '_MEIPASS', _app_dir()), 'nltk_data'), NLTK_DATA_DIR):
+        if os.path.isdir(data_dir) and data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, data_dir)
+
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon', download_dir=NLTK_DATA_DIR, quiet=True)
+        if NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
 
 
 def pretty_json(json_obj):
@@ -81,59 +237,229 @@ def pretty_json(json_obj):
 
 
 
-def extract_text_from_pdf(content_bytes):
+def _as_stream(document):
+    # Extractors take raw bytes or an already open binary file (e.g. a spooled download)
+    return BytesIO(document) if isinstance(document, (bytes, bytearray)) else document
+
+
+def iter_text_from_pdf(document):
     """
-    Extract text from the first `max_pages` of a PDF, up to `max_chars` characters.
+    Yield the text of the first `max_pages` pages of a PDF, page by page, stopping once
+    `max_chars` characters have been yielded. `document` is the PDF as bytes or a seekable binary file.
     """
+    PyPDF2 = _import_pypdf2()
     if not PyPDF2:
-        return ""
-    reader = PyPDF2.PdfReader(BytesIO(content_bytes))
-    text = ""
+        return
+    reader = PyPDF2.PdfReader(_as_stream(document))
+    budget = MAX_CHARS
     for i, page in enumerate(reader.pages):
-        if i >= PDF_MAX_PAGES or len(text) >= MAX_CHARS:
-            break
-        page_text = page.extract_text() or ""
-        text += page_text
-        if len(text) >= MAX_CHARS:
-            text = text[:MAX_CHARS]
+        if i >= PDF_MAX_PAGES or budget <= 0:
             break
-    return text
+        page_text = (page.extract_text() or "")[:budget]
+        budget -= len(page_text)
+        if page_text:
+            yield page_text
 
-def extract_text_from_docx(content_bytes):
+
+def iter_text_from_docx(document):
     """
-    Extract text from the first `max_paragraphs` of a DOCX, up to `max_chars` characters.
+    Yield the first `max_paragraphs` paragraphs of a DOCX (newline separated), stopping once
+    `max_chars` characters have been yielded. `document` is the DOCX as bytes or a seekable binary file.
     """
+    docx = _import_docx()
     if not docx:
-        return ""
-    file_stream = BytesIO(content_bytes)
-    document = docx.Document(file_stream)
-    paragraphs = []
-    for i, para in enumerate(document.paragraphs):
-        if i >= DOCX_MAX_PARAGRAPHS or sum(len(p) for p in paragraphs) >= MAX_CHARS:
+        return
+    word_document = docx.Document(_as_stream(document))
+    budget = MAX_CHARS
+    for i, para in enumerate(word_document.paragraphs):
+        if i >= DOCX_MAX_PARAGRAPHS or budget <= 0:
             break
-        paragraphs.append(para.text)
-        if sum(len(p) for p in paragraphs) >= MAX_CHARS:
+        chunk = (para.text if i == 0 else "\n" + para.text)[:budget]
+        budget -= len(chunk)
+        yield chunk
+
+
+def extract_text_from_pdf(document):
+    """
+    Extract text from the first `max_pages` of a PDF, up to `max_chars` characters.
+    """
+    return "".join(iter_text_from_pdf(document))
+
+
+def extract_text_from_docx(document):
+    """
+    Extract text from the first `max_paragraphs` of a DOCX, up to `max_chars` characters.
+    """
+    return "".join(iter_text_from_docx(document))
+
+
+# Elements whose content is never article text. Not <form>: ASP.NET WebForms pages wrap the whole
+# body in one, its controls are dropped by 'button', 'select' and the void 'input'
+BOILERPLATE_TAGS = {'head', 'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe',
+                    'nav', 'header', 'footer', 'aside', 'button', 'select', 'menu'}
+# Inside these a <header> holds the headline rather than site navigation
+CONTENT_TAGS = {'article', 'main'}
+BOILERPLATE_ROLES = {'navigation', 'banner', 'contentinfo', 'complementary', 'search', 'menu'}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'td', 'th', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+              'article', 'section', 'main', 'blockquote', 'pre', 'table', 'ul', 'ol', 'dl', 'dt', 'dd'}
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """
+    Collects visible body text, skipping boilerplate elements, until `max_chars` characters are gathered.
+    """
+
+    def __init__(self, max_chars):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.length = 0
+        self._parts = []
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._content_depth = 0
+
+    @property
+    def full(self):
+        return self.length >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        boilerplate = tag in BOILERPLATE_TAGS and not (tag == 'header' and self._content_depth)
+        if tag not in VOID_TAGS and (boilerplate or dict(attrs).get('role') in BOILERPLATE_ROLES):
+            self._skip_tag = tag
+            self._skip_depth = 1
+            return
+        if tag in CONTENT_TAGS:
+            self._content_depth += 1
+        if tag in BLOCK_TAGS:
+            self._parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if self._skip_tag == tag:
+            self._skip_depth -= 1
+            if self._skip_depth == 0:
+                self._skip_tag = None
+        elif not self._skip_tag:
+            if tag in CONTENT_TAGS and self._content_depth:
+                self._content_depth -= 1
+            if tag in BLOCK_TAGS:
+                self._parts.append('\n')
+
+    def handle_data(self, data):
+        if self._skip_tag or self.full:
+            return
+        # Text is handed over as it streams in, split wherever a chunk ended: keep its own
+        # whitespace (collapsed) rather than adding a separator, which could split a word
+        text = re.sub(r'\s+', ' ', data)
+        if text.strip():
+            text = text[:self.max_chars - self.length]
+            self._parts.append(text)
+            self.length += len(text)
+        elif text:
+            self._parts.append(' ')
+
+    def text(self):
+        return re.sub(r' *\n[ \n]*', '\n', re.sub(r' +', ' ', ''.join(self._parts))).strip()
+
+
+def extract_text_from_html(chunks, encoding='utf-8'):
+    """
+    Extract article text from streamed HTML `chunks` (bytes), dropping markup, scripts, styles and
+    navigation boilerplate. Stops reading the stream once `max_chars` characters of text are collected.
+    """
+    extractor = _HTMLTextExtractor(MAX_CHARS)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        if extractor.full:
             break
-    text = "\n".join(paragraphs)
-    return text[:MAX_CHARS]
-
-
-def display_response_tree(tree, json_obj):
-    tree.delete(*tree.get_children())  # Clear existing items
-
-    def _display_tree(parent, data):
-        if isinstance(data, dict):
-            for key, value in data.items():
-                child = tree.insert(parent, "end", text=key)
-                _display_tree(child, value)
-        elif isinstance(data, list):
-            for index, item in enumerate(data):
-                child = tree.insert(parent, "end", text=str(index))
-                _display_tree(child, item)
+    else:
+        extractor.feed(decoder.decode(b'', final=True))
+        extractor.close()
+    return extractor.text()
+
+
+class JsonTreeView:
+    """
+    Shows parsed JSON documents (one top-level node each) in a ttk.Treeview, inserting the
+    children of a node only when it is first expanded (<<TreeviewOpen>>), at most CHILD_BATCH
+    at a time; the rest of a large object or list is behind a "... more" node that loads the
+    next batch.
+    """
+    CHILD_BATCH = 200
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._pending = {}  # node -> (parent, data, offset) still to be inserted when it is opened
+        tree.bind('<<TreeviewOpen>>', self._on_open)
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+        self._pending.clear()
+
+    def add(self, json_obj, label):
+        node = self.tree.insert('', 'end', text=label)
+        if isinstance(json_obj, (dict, list)):
+            if json_obj:
+                self._defer(node, node, json_obj, 0)
         else:
-            tree.insert(parent, "end", text=str(data))
+            self.tree.insert(node, 'end', text=str(json_obj))
+
+    def _insert_children(self, parent, data, offset):
+        entries = data.items() if isinstance(data, dict) else enumerate(data)
+        for key, value in itertools.islice(entries, offset, offset + self.CHILD_BATCH):
+            node = self.tree.insert(parent, 'end', text=str(key))
+            if isinstance(value, (dict, list)):
+                if value:
+                    self._defer(node, node, value, 0)
+            else:
+                self.tree.insert(node, 'end', text=str(value))
+
+        remaining = len(data) - offset - self.CHILD_BATCH
+        if remaining > 0:
+            more = self.tree.insert(parent, 'end', text=f'... {remaining} more')
+            self._defer(more, parent, data, offset + self.CHILD_BATCH)
+
+    def _defer(self, node, parent, data, offset):
+        # A placeholder child makes the node expandable without inserting its real children
+        self.tree.insert(node, 'end', text='...')
+        self._pending[node] = (parent, data, offset)
+
+    def _on_open(self, event):
+        node = self.tree.focus()
+        pending = self._pending.pop(node, None)
+        if pending is None:
+            return
+        parent, data, offset = pending
+        if parent == node:
+            self.tree.delete(*self.tree.get_children(node))
+            self._insert_children(parent, data, offset)
+        else:
+            # Tk still sets -open on the item after this event, so the "... more" node is
+            # replaced by the next batch once the event has been handled
+            self.tree.after_idle(self._load_more, node, parent, data, offset)
+
+    def _load_more(self, node, parent, data, offset):
+        if self.tree.exists(node):
+            self.tree.delete(node)
+            self._insert_children(parent, data, offset)
 
-    _display_tree("", json_obj)
+
+def search_response_label(data):
+    """
+    Return a tree label for a search API response: its query and result range.
+    """
+    try:
+        request = data['queries']['request'][0]
+        start = int(request.get('startIndex', 1))
+        count = int(request.get('count', 0))
+        return f"{request['searchTerms']} [{start}-{start + max(count, 1) - 1}]"
+    except (KeyError, IndexError, TypeError, ValueError):
+        return "Response"
 
 
 def update_textarea(textarea, message):
@@ -141,9 +467,45 @@ def update_textarea(textarea, message):
     textarea.see(tk.END)
 
 
-def calculate_sentiment_score(text):
-    sid = SentimentIntensityAnalyzer()
-    sentiment_scores = sid.polarity_scores(text)
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_sentiment_analyzer():
+    """
+    Return the shared SentimentIntensityAnalyzer, loading the VADER lexicon only once.
+    polarity_scores() only reads the lexicon, so the instance is safe to share between threads.
+    """
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                import matplotlib # Required by nltk to load runtime worfreqs DONT DELETE
+                _ensure_vader_lexicon()
+                from nltk.sentiment.vader import SentimentIntensityAnalyzer
+                _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def calculate_sentiment_score(text, hits=None):
+    """
+    Return the risk (negated VADER compound) score of a document, scored as a whole or by
+    sentence depending on `scoring_mode`. `hits` are the KeywordMatcher hits in the text;
+    keyword_proximity aggregation uses the keyword ones.
+    """
+    # Accept the chunk generators of the document extractors as well as plain text
+    if not isinstance(text, str):
+        text = "".join(text)
+    if SCORING_MODE == 'sentences':
+        sentences = split_sentences(text)
+        hit_sentences = None
+        if hits:
+            starts = [start for start, _ in sentences]
+            hit_sentences = sorted({max(0, bisect.bisect_right(starts, hit_start) - 1)
+                                    for hit_start, _, kind in hits if kind == 'keyword'})
+        return score_sentences([sentence for _, sentence in sentences], hit_sentences)
+
+    sentiment_scores = get_sentiment_analyzer().polarity_scores(text)
 
     # Adjust the compound score to represent risk
     risk_score = sentiment_scores['compound'] * -1
@@ -151,8 +513,185 @@ def calculate_sentiment_score(text):
     return risk_score
 
 
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\s*\n\s*')
+
+
+def split_sentences(text):
+    """
+    Return the (offset, sentence) pairs of `text`.
+    """
+    sentences = []
+    start = 0
+    for boundary in SENTENCE_BOUNDARY.finditer(text):
+        if boundary.start() > start:
+            sentences.append((start, text[start:boundary.start()]))
+        start = boundary.end()
+    if start < len(text) and not text[start:].isspace():
+        sentences.append((start, text[start:]))
+    return sentences
+
+
+def score_sentences(sentences, hit_sentences=None):
+    """
+    Score each sentence and combine their risk scores by `sentence_aggregation`:
+    'max' (the worst sentence), 'top_k_mean' (mean of the `sentence_top_k` worst) or
+    'keyword_proximity' (the worst sentence, with risk discounted by its distance in
+    sentences from the nearest one mentioning a search keyword, given as the sorted
+    `hit_sentences` indexes; with no keyword hits it falls back to 'top_k_mean').
+    Stops as soon as the score can only end up Very High Risk.
+    """
+    if not sentences:
+        return 0.0
+
+    aggregation = SENTENCE_AGGREGATION
+    keyword_positions = []
+    if aggregation == 'keyword_proximity':
+        keyword_positions = hit_sentences or []
+        if not keyword_positions:
+            aggregation = 'top_k_mean'
+
+    top_k = max(1, SENTENCE_TOP_K) if aggregation == 'top_k_mean' else 1
+    sid = get_sentiment_analyzer()
+    worst = []  # min-heap of the `top_k` highest sentence risks so far
+    for index, sentence in enumerate(sentences):
+        risk = sid.polarity_scores(sentence)['compound'] * -1
+        if keyword_positions and risk > 0:
+            nearest = bisect.bisect_left(keyword_positions, index)
+            distance = min(abs(index - keyword_positions[position])
+                           for position in (nearest - 1, nearest) if 0 <= position < len(keyword_positions))
+            risk /= 1 + distance
+        if len(worst) < top_k:
+            heapq.heappush(worst, risk)
+        elif risk > worst[0]:
+            heapq.heapreplace(worst, risk)
+        # The mean of the top k can only grow from here once k sentences have been scored
+        if len(worst) == top_k and sum(worst) / top_k > VERY_HIGH_RISK_SCORE:
+            break
+
+    return sum(worst) / len(worst)
+
+
+_scoring_pool = None
+_scoring_pool_lock = threading.Lock()
+
+
+def _init_scoring_worker(settings):
+    # Scoring processes start from a fresh import of this module: apply the parent's
+    # extraction limits and scoring settings and load the lexicon once per process
+    global MAX_CHARS, PDF_MAX_PAGES, DOCX_MAX_PARAGRAPHS, SCORING_MODE, SENTENCE_AGGREGATION, SENTENCE_TOP_K
+    MAX_CHARS, PDF_MAX_PAGES, DOCX_MAX_PARAGRAPHS, SCORING_MODE, SENTENCE_AGGREGATION, SENTENCE_TOP_K = settings
+    get_sentiment_analyzer()
+
+
+def get_scoring_pool():
+    """
+    Return the shared process pool for CPU-bound extraction and scoring,
+    or None when `scoring_processes` is 0 and this work stays on the fetch threads.
+    """
+    global _scoring_pool
+    if SCORING_PROCESSES <= 0:
+        return None
+    if _scoring_pool is None:
+        with _scoring_pool_lock:
+            if _scoring_pool is None:
+                # spawn rather than fork: the parent runs curl and fetch threads
+                _scoring_pool = ProcessPoolExecutor(max_workers=SCORING_PROCESSES,
+                                                    mp_context=multiprocessing.get_context('spawn'),
+                                                    initializer=_init_scoring_worker,
+                                                    initargs=((MAX_CHARS, PDF_MAX_PAGES, DOCX_MAX_PARAGRAPHS, SCORING_MODE,
+                                                               SENTENCE_AGGREGATION, SENTENCE_TOP_K),))
+    return _scoring_pool
+
+
+def _extract_and_score(kind, document, matcher=None):
+    """
+    Extract a 'pdf' or 'docx' `document` (bytes, binary file or path) and score it.
+    Returns (sentiment score, extract seconds, score seconds); the score is None
+    when `matcher` rejects the text.
+    """
+    iter_text = iter_text_from_pdf if kind == 'pdf' else iter_text_from_docx
+    start = time.perf_counter()
+    if isinstance(document, str):
+        with open(document, 'rb') as document_file:
+            text = "".join(iter_text(document_file))
+    else:
+        text = "".join(iter_text(document))
+    extracted = time.perf_counter()
+    hits = matcher.find(text) if matcher else None
+    if matcher and not matcher.accepts(hits):
+        sentiment_score = None
+    else:
+        sentiment_score = calculate_sentiment_score(text, hits)
+    return sentiment_score, extracted - start, time.perf_counter() - extracted
+
+
+def score_document(kind, document, size, matcher=None):
+    """
+    Extract and score a spooled 'pdf' or 'docx' `document` of `size` bytes,
+    on the scoring process pool when it is enabled. Returns None when `matcher` rejects it.
+    """
+    pool = get_scoring_pool()
+    if pool is None:
+        sentiment_score, extract_seconds, score_seconds = _extract_and_score(kind, document, matcher)
+    else:
+        document.seek(0)
+        if size <= DOCUMENT_SPOOL_MB * 1024 * 1024:
+            job = pool.submit(_extract_and_score, kind, document.read(), matcher)
+            sentiment_score, extract_seconds, score_seconds = job.result()
+        else:
+            # Documents spooled to disk are handed over as a file instead of being pickled
+            with tempfile.NamedTemporaryFile(delete=False) as document_copy:
+                shutil.copyfileobj(document, document_copy)
+            try:
+                job = pool.submit(_extract_and_score, kind, document_copy.name, matcher)
+                sentiment_score, extract_seconds, score_seconds = job.result()
+            finally:
+                os.remove(document_copy.name)
+
+    observe_stage('extract', extract_seconds)
+    observe_stage('score', score_seconds)
+    return sentiment_score
+
+
+def score_text(text, matcher=None):
+    """
+    Score extracted text, on the scoring process pool when it is enabled.
+    Returns None when `matcher` rejects the text, before any scoring work is done.
+    """
+    pool = get_scoring_pool()
+    with stage_timer('score'):
+        hits = matcher.find(text) if matcher else None
+        if matcher and not matcher.accepts(hits):
+            return None
+        if pool is None:
+            return calculate_sentiment_score(text, hits)
+        return pool.submit(calculate_sentiment_score, text, hits).result()
+
+
+def score_texts(texts):
+    """
+    Score many documents with the shared analyzer.
+    Returns one dict per text with its VADER compound, sentiment (risk) score and risk category.
+    """
+    sid = get_sentiment_analyzer()
+    results = []
+    for text in texts:
+        compound = sid.polarity_scores(text)['compound']
+        sentiment_score = compound * -1
+        results.append({
+            'compound': compound,
+            'sentiment_score': sentiment_score,
+            'risk_score': calculate_risk_score(sentiment_score),
+        })
+    return results
+
+
+# Sentence scoring stops once a document is past this
+VERY_HIGH_RISK_SCORE = 0.3
+
+
 def calculate_risk_score(sentiment_score):
-    if sentiment_score > 0.3:
+    if sentiment_score > VERY_HIGH_RISK_SCORE:
         return "Very High Risk"
     elif sentiment_score > 0.1:
         return "High Risk"
@@ -164,140 +703,1708 @@ def calculate_risk_score(sentiment_score):
         return "Very Low Risk"
 
 
-def search_and_score_with_api(customer_name, languages_keywords, selected_languages, excluded_sites, num_results=TOTAL_RESULTS,
-                              api_key=None, high_risk_links=None, very_high_risk_links=None):
-    
-    if not customer_name or not customer_name.strip() or len(customer_name.strip()) < NAME_MIN_LENGTH:
-        messagebox.showwarning("Input Error", "Please enter a customer name with at least 3 characters before searching.")
+_host_slots = {}  # key -> [slots held, threads waiting, callbacks waiting]
+_host_slots_changed = threading.Condition()
+
+
+class HostSlot:
+    """
+    One of the parallel request slots of a host, taken by _acquire_host_slot() and held until release().
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._released = False
+
+    def release(self):
+        # Safe to call again, e.g. from a finally block after an early release
+        with _host_slots_changed:
+            if self._released:
+                return
+            self._released = True
+        while True:
+            with _host_slots_changed:
+                entry = _host_slots[self.key]
+                if entry[1] or not entry[2]:
+                    entry[0] -= 1
+                    if entry[0] == 0 and not entry[1] and not entry[2]:
+                        del _host_slots[self.key]
+                    else:
+                        _host_slots_changed.notify_all()
+                    return
+                # The slot passes straight to the next waiting callback, called outside the lock
+                on_free = entry[2].popleft()
+            if on_free(HostSlot(self.key)):
+                return
+
+
+def _acquire_host_slot(link, on_free=None):
+    """
+    Take one of the parallel request slots for the host of `link` and return it as a HostSlot.
+    When the host has no free slot this waits for one, or with `on_free` returns None at once:
+    on_free(slot) is then called with a slot as soon as one is released, and returns whether it
+    took it (otherwise the slot goes to the next in line).
+    Custom Search API requests get their own slots, as many as there are page workers.
+    A host's entry is dropped as soon as no request holds or waits for one of its slots.
+    """
+    if link.startswith(GOOGLE_SEARCH_API_URL):
+        key, limit = GOOGLE_SEARCH_API_URL, SEARCH_PAGE_WORKERS
+    else:
+        key, limit = urlparse(link).netloc.lower(), FETCH_PER_HOST_LIMIT
+    with _host_slots_changed:
+        entry = _host_slots.setdefault(key, [0, 0, collections.deque()])
+        if entry[0] >= max(1, limit):
+            if on_free is not None:
+                entry[2].append(on_free)
+                return None
+            entry[1] += 1
+            while entry[0] >= max(1, limit):
+                _host_slots_changed.wait()
+            entry[1] -= 1
+        entry[0] += 1
+    return HostSlot(key)
+
+
+class PipelineMetrics:
+    """
+    Thread-safe, process-wide latency histograms per pipeline stage and event counters.
+    Values are cumulative so the Prometheus export can be scraped like any counter.
+    """
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, stage, seconds):
+        index = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = {'buckets': [0] * (len(self.BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+            histogram['buckets'][index] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+    def increment(self, name, kind=None, amount=1):
+        with self._lock:
+            self._counters[(name, kind)] = self._counters.get((name, kind), 0) + amount
+
+    def to_dict(self):
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._histograms.items():
+                cumulative = 0
+                buckets = {}
+                for bound, bucket_count in zip(self.BUCKETS + ('+Inf',), histogram['buckets']):
+                    cumulative += bucket_count
+                    buckets[str(bound)] = cumulative
+                stages[stage] = {
+                    'count': histogram['count'],
+                    'sum_seconds': histogram['sum'],
+                    'mean_seconds': histogram['sum'] / histogram['count'],
+                    'buckets': buckets,
+                }
+            counters = {}
+            for (name, kind), value in sorted(self._counters.items(), key=lambda entry: (entry[0][0], entry[0][1] or '')):
+                if kind is None:
+                    counters[name] = value
+                else:
+                    counters.setdefault(name, {})[kind] = value
+        return {'stages': stages, 'counters': counters}
+
+    def to_prometheus(self, prefix='negative_news'):
+        snapshot = self.to_dict()
+        lines = [f'# TYPE {prefix}_stage_seconds histogram']
+        for stage, histogram in snapshot['stages'].items():
+            for bound, cumulative in histogram['buckets'].items():
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram["sum_seconds"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+        for name, value in snapshot['counters'].items():
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            if isinstance(value, dict):
+                for kind, kind_value in value.items():
+                    lines.append(f'{prefix}_{name}_total{{kind="{kind}"}} {kind_value}')
+            else:
+                lines.append(f'{prefix}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = PipelineMetrics()
+
+
+@contextmanager
+def stage_timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def observe_stage(stage, seconds):
+    if METRICS_ENABLED:
+        METRICS.observe(stage, seconds)
+
+
+def count_event(name, kind=None, amount=1):
+    if METRICS_ENABLED:
+        METRICS.increment(name, kind, amount)
+
+
+def _write_atomically(path, text):
+    # Readers (e.g. a node_exporter textfile collector) never see a half written file; each
+    # writer gets its own temp file, as concurrent screenings (--serve) export at the same time
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(text)
+        os.chmod(temp_path, 0o644)  # mkstemp creates the file readable by its owner only
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def export_metrics():
+    """
+    Write the cumulative pipeline metrics to `metrics_json_path` and `metrics_prometheus_path`.
+    """
+    if not METRICS_ENABLED:
         return
+    try:
+        if METRICS_JSON_PATH:
+            _write_atomically(METRICS_JSON_PATH, json.dumps(METRICS.to_dict(), indent=4))
+        if METRICS_PROMETHEUS_PATH:
+            _write_atomically(METRICS_PROMETHEUS_PATH, METRICS.to_prometheus())
+    except OSError as e:
+        print(f"Could not export metrics: {e}", file=sys.stderr)
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for a curl_cffi response, rebuilt from a cache entry.
+    """
+    from_cache = True
+
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.elapsed = 0.0
+
+    @property
+    def text(self):
+        return self.content.decode(response_encoding(self.headers), errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=64 * 1024):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def response_encoding(headers):
+    """
+    Return the charset declared in the Content-Type header, defaulting to utf-8.
+    """
+    match = re.search(r'charset=["\']?([\w-]+)', headers.get('Content-Type', ''))
+    if match:
+        try:
+            return codecs.lookup(match.group(1)).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of search API responses and fetched documents.
+    Entries expire after `ttl_seconds`; once the cache grows past `max_bytes` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path, ttl_seconds, max_bytes):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, content BLOB, '
+            'size INTEGER, created REAL, last_access REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)')
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status_code, headers, content, created FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            status_code, headers, content, created = row
+            if now - created > self.ttl_seconds:
+                self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+        return CachedResponse(content, status_code, json.loads(headers))
+
+    def put(self, key, status_code, content_type, content):
+        headers = {'Content-Type': content_type}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, status_code, json.dumps(headers), content, len(content), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute('DELETE FROM entries WHERE created < ?', (now - self.ttl_seconds,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute('SELECT key, size FROM entries ORDER BY last_access').fetchall():
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Return the shared ResponseCache, or None when caching is disabled in config.json.
+    """
+    global _response_cache
+    if not CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(CACHE_PATH, CACHE_TTL_SECONDS, CACHE_MAX_MB * 1024 * 1024)
+    return _response_cache
+
+
+class ResultsStore:
+    """
+    SQLite store of past screening results, keyed by customer and normalized URL.
+    Keeps each document's content hash, ETag/Last-Modified validators and scores (null for
+    documents the keyword prefilter rejected) so a re-screen can tell new and changed
+    documents from ones it has already seen.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'customer TEXT, url_key TEXT, link TEXT, content_hash TEXT, etag TEXT, last_modified TEXT, '
+            'sentiment_score REAL, risk_score TEXT, first_seen REAL, last_checked REAL, last_changed REAL, '
+            'PRIMARY KEY (customer, url_key))'
+        )
+        self._conn.commit()
+
+    def get(self, customer, url_key):
+        """
+        Return the stored result of `url_key` for `customer` as a dict, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT link, content_hash, etag, last_modified, sentiment_score, risk_score, '
+                'first_seen, last_checked, last_changed FROM results WHERE customer = ? AND url_key = ?',
+                (customer, url_key)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ('link', 'content_hash', 'etag', 'last_modified', 'sentiment_score', 'risk_score',
+                'first_seen', 'last_checked', 'last_changed')
+        return dict(zip(keys, row))
+
+    def record(self, customer, url_key, result):
+        """
+        Store a scored link result; unchanged documents only have their check time updated.
+        """
+        now = time.time()
+        with self._lock:
+            if result.change == 'unchanged':
+                self._conn.execute(
+                    'UPDATE results SET last_checked = ?, etag = COALESCE(?, etag), '
+                    'last_modified = COALESCE(?, last_modified) WHERE customer = ? AND url_key = ?',
+                    (now, result.etag, result.last_modified, customer, url_key)
+                )
+            else:
+                self._conn.execute(
+                    'INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (customer, url_key) DO UPDATE SET link = excluded.link, '
+                    'content_hash = excluded.content_hash, etag = excluded.etag, '
+                    'last_modified = excluded.last_modified, sentiment_score = excluded.sentiment_score, '
+                    'risk_score = excluded.risk_score, last_checked = excluded.last_checked, '
+                    'last_changed = excluded.last_changed',
+                    (customer, url_key, result.link, result.content_hash, result.etag,
+                     result.last_modified, result.sentiment_score, result.risk_score, now, now, now)
+                )
+            self._conn.commit()
+
+
+_results_store = None
+_results_store_lock = threading.Lock()
+
+
+def get_results_store():
+    """
+    Return the shared ResultsStore, or None when incremental screening is disabled in config.json.
+    """
+    global _results_store
+    if not INCREMENTAL_SCREENING:
+        return None
+    if _results_store is None:
+        with _results_store_lock:
+            if _results_store is None:
+                _results_store = ResultsStore(RESULTS_STORE_PATH)
+    return _results_store
+
+
+def customer_key(customer_name):
+    # Re-screens of "ACME  Corp" and "acme corp" share their stored results
+    return ' '.join(customer_name.split()).casefold()
+
+
+def search_cache_key(search_params):
+    # The API key doesn't change the results, everything else (q with its excluded sites, cx, num, start) does
+    params = {key: value for key, value in search_params.items() if key != 'key'}
+    return 'search:' + hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _cached_get(cache_key, url, **kwargs):
+    """
+    GET `url` unless a fresh copy is cached under `cache_key`; successful responses are cached.
+    """
+    cache = get_response_cache()
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    response = _get_with_retries(url, **kwargs)
+    if cache and response.status_code == 200:
+        cache.put(cache_key, response.status_code, response.headers.get('Content-Type', ''), response.content)
+    return response
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Return the shared curl_cffi session. Each thread gets its own curl handle from it,
+    so connections and TLS sessions are reused across requests made by a worker.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = curl_requests.Session(impersonate=CURL_CFFI_IMPERSONATOR, verify=True)
+                # Streaming responses are read on the session's executor, whose default size
+                # (cpu_count + 4) would otherwise cap parallel fetches on small machines.
+                # _executor is a private attribute of the pinned curl-cffi 0.11.1 Session; recheck
+                # this when upgrading curl-cffi
+                session._executor = ThreadPoolExecutor(max_workers=max(1, FETCH_MAX_WORKERS) + 4)
+                _http_session = session
+    return _http_session
+
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(curl_requests.errors.RequestsError):
+    """
+    Raised instead of sending a request to a host that recently failed repeatedly.
+    """
+
+
+class RetryLater(Exception):
+    """
+    Raised by _get_with_retries(defer_retries=True) instead of sleeping: the caller should try
+    again with `attempt` once `delay` seconds have passed.
+    """
+
+    def __init__(self, delay, attempt):
+        super().__init__(f'retry {attempt} in {delay:.1f}s')
+        self.delay = delay
+        self.attempt = attempt
+
+
+_circuits = {}
+_circuits_lock = threading.Lock()
+_circuits_swept_at = 0.0
+
+
+def _check_circuit(host):
+    with _circuits_lock:
+        failures, opened_at, _ = _circuits.get(host, (0, None, None))
+        if opened_at is not None and time.monotonic() - opened_at < CIRCUIT_BREAKER_COOLDOWN:
+            raise CircuitOpenError(f"Circuit open for {host} after {failures} consecutive failures")
+
+
+def _record_host_result(host, success):
+    global _circuits_swept_at
+    with _circuits_lock:
+        if success:
+            _circuits.pop(host, None)
+            return
+        now = time.monotonic()
+        failures = _circuits.get(host, (0, None, None))[0] + 1
+        # Once tripped, a failed trial request after the cooldown re-opens the circuit straight away
+        opened_at = now if failures >= CIRCUIT_BREAKER_THRESHOLD else None
+        _circuits[host] = (failures, opened_at, now)
+        # Hosts that haven't failed for a whole cooldown start over, so failing hosts that are
+        # never requested again don't pile up
+        if now - _circuits_swept_at >= CIRCUIT_BREAKER_COOLDOWN:
+            _circuits_swept_at = now
+            for stale in [key for key, (_, _, failed_at) in _circuits.items() if now - failed_at >= CIRCUIT_BREAKER_COOLDOWN]:
+                del _circuits[stale]
+
+
+def _retry_after(response):
+    """
+    Return the delay in seconds requested by a Retry-After header, or None.
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt, response=None):
+    delay = _retry_after(response) if response is not None else None
+    if delay is None:
+        # Exponential backoff with full jitter
+        delay = random.uniform(0, RETRY_BACKOFF_BASE * (2 ** attempt))
+    return min(delay, RETRY_BACKOFF_MAX)
+
+
+def _get_with_retries(url, stream=False, attempt=0, defer_retries=False, slot=None, **kwargs):
+    """
+    GET `url`, retrying transient failures (request errors, 429 and 5xx) up to MAX_RETRIES times.
+    A slot of the host is held while the request is in flight but not during the backoff, so a
+    worker waiting to retry doesn't hold up other fetches to the same host.
+    With `defer_retries` the backoff isn't slept here: RetryLater is raised and the caller calls
+    again with its `attempt` after the delay, so the waiting doesn't occupy a worker thread.
+    With `stream` the body is left unread and (response, slot) is returned: the host slot stays
+    held for the download, and the caller must close() the response and release() the slot.
+    `slot` is a slot of the host already taken for the first attempt (see submit_link()).
+    """
+    host = urlparse(url).netloc.lower()
+    while True:
+        try:
+            _check_circuit(host)
+        except CircuitOpenError:
+            if slot:
+                slot.release()
+            raise
+        if slot is None:
+            slot = _acquire_host_slot(url)
+        response = None
+        try:
+            response = get_http_session().get(
+                url,
+                timeout=CONNECT_TIMEOUT + READ_TIMEOUT,
+                impersonate=CURL_CFFI_IMPERSONATOR,
+                verify=True,
+                stream=stream,
+                **kwargs
+            )
+        except curl_requests.errors.RequestsError:
+            slot.release()
+            _record_host_result(host, success=False)
+            if attempt >= MAX_RETRIES:
+                raise
+        except BaseException:
+            slot.release()
+            raise
+        else:
+            retry = response.status_code in RETRY_STATUS_CODES
+            # 429 means the host is up but throttling us, only server errors count against the circuit
+            _record_host_result(host, success=not retry or response.status_code == 429)
+            if not retry or attempt >= MAX_RETRIES:
+                if stream:
+                    return response, slot
+                slot.release()
+                return response
+            response.close()
+            slot.release()
+        slot = None
+
+        count_event('retries')
+        delay = _backoff_delay(attempt, response)
+        if defer_retries:
+            raise RetryLater(delay, attempt + 1)
+        time.sleep(delay)
+        attempt += 1
+
+
+def search_api(search_params):
+    return _cached_get(search_cache_key(search_params), GOOGLE_SEARCH_API_URL, params=search_params)
+
+
+# Query parameters that only track the click, not which document is served
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'yclid', 'dclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl', 'ref_src'}
+
+
+def normalize_url(link):
+    """
+    Return the key identifying the document behind a result URL. Scheme, host case, default ports,
+    fragments, trailing slashes, tracking parameters and query parameter order are ignored.
+    """
+    parts = urlsplit(link.strip())
+    host = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f'{host}:{port}'
+    path = parts.path.rstrip('/') or '/'
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS]
+    return urlunsplit(('', host, path, urlencode(sorted(query)), ''))
+
+
+# Custom Search API limits: at most 10 results per request and none past the 100th result
+SEARCH_PAGE_SIZE = 10
+SEARCH_MAX_RESULTS = 100
+
+
+def plan_search_pages(num_results, max_requests=None):
+    """
+    Split `num_results` into Custom Search API pages, returned as (start, num) pairs.
+    """
+    num_results = max(0, min(num_results, SEARCH_MAX_RESULTS))
+    pages = [(start, min(SEARCH_PAGE_SIZE, num_results - start + 1))
+             for start in range(1, num_results + 1, SEARCH_PAGE_SIZE)]
+    return pages if max_requests is None else pages[:max(0, max_requests)]
+
+
+class SearchRequestFailed(curl_requests.errors.RequestsError):
+    """
+    Raised when the search API answers a page request with an error (quota exhausted, bad key, ...).
+    """
+
+
+def search_page(search_params):
+    """
+    Fetch one page of search results and return the parsed JSON response.
+    Raises SearchRequestFailed for a non-200 response, whose body has no results to report.
+    """
+    with stage_timer('api'):
+        response = search_api(search_params)
+    count_event('cache_hits' if getattr(response, 'from_cache', False) else 'cache_misses', 'search')
+    print(str(response.text))
+    if response.status_code != 200:
+        count_event('errors', 'search')
+        try:
+            detail = response.json()['error']['message']
+        except (ValueError, KeyError, TypeError):
+            detail = response.text[:200]
+        raise SearchRequestFailed(f"HTTP {response.status_code}: {detail}")
+    return response.json()
+
+
+def conditional_headers(previous):
+    """
+    Return If-None-Match/If-Modified-Since headers revalidating a previously screened document.
+    """
+    headers = {}
+    if previous:
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+    return headers
+
+
+def fetch_link(link, previous=None, attempt=0, defer_retries=False, slot=None):
+    """
+    Open a streaming GET for `link`, or return its fresh cached copy, as (response, host slot);
+    the slot is None for a cached copy.
+    With the `previous` stored result the GET is conditional and may come back 304 Not Modified.
+    `attempt`, `defer_retries` and `slot` are passed on to _get_with_retries().
+    Read the body with iter_content(), then close() the response and release() the slot.
+    """
+    cache = get_response_cache()
+    if cache:
+        cached = cache.get('url:' + link)
+        if cached is not None:
+            count_event('cache_hits', 'document')
+            if slot:
+                slot.release()
+            return cached, None
+        count_event('cache_misses', 'document')
+    headers = conditional_headers(previous)
+    with stage_timer('fetch'):
+        if headers:
+            return _get_with_retries(link, stream=True, attempt=attempt, defer_retries=defer_retries, slot=slot,
+                                     headers=headers)
+        return _get_with_retries(link, stream=True, attempt=attempt, defer_retries=defer_retries, slot=slot)
+
+
+class DocumentSkipped(Exception):
+    """
+    Raised when a fetched link is deliberately not downloaded or parsed (too large, unsupported type).
+    """
+
+
+class NoMentions(DocumentSkipped):
+    """
+    Raised when a document's text doesn't mention what the keyword prefilter requires.
+    """
+
+
+# Content types that never carry text worth scoring
+SKIPPED_CONTENT_TYPES = ('image/', 'video/', 'audio/', 'font/', 'application/zip', 'application/x-rar',
+                         'application/gzip', 'application/x-7z', 'application/x-msdownload')
+
+
+def _max_download_bytes():
+    return int(MAX_DOWNLOAD_MB * 1024 * 1024)
+
+
+def _check_download_headers(response, content_type):
+    """
+    Refuse a download up front from its headers, before any of the body is read.
+    """
+    if content_type.lower().startswith(SKIPPED_CONTENT_TYPES):
+        raise DocumentSkipped(f"unsupported content type {content_type}")
+    content_length = response.headers.get('Content-Length', '')
+    if content_length.isdigit() and int(content_length) > _max_download_bytes():
+        raise DocumentSkipped(f"{int(content_length)} bytes exceeds max_download_mb={MAX_DOWNLOAD_MB}")
+
+
+def _capped(chunks, max_bytes):
+    # Stop reading a body once `max_bytes` have been received
+    received = 0
+    for chunk in chunks:
+        remaining = max_bytes - received
+        if remaining <= 0:
+            break
+        chunk = chunk[:remaining]
+        received += len(chunk)
+        yield chunk
+
+
+def _spool_document(chunks):
+    """
+    Copy a PDF/DOCX body into a temp file that stays in memory up to `document_spool_mb` and moves
+    to disk beyond that. Returns (file, size); a body over `max_download_mb` is abandoned.
+    """
+    max_bytes = _max_download_bytes()
+    spool = tempfile.SpooledTemporaryFile(max_size=int(DOCUMENT_SPOOL_MB * 1024 * 1024))
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            spool.close()
+            raise DocumentSkipped(f"download exceeds max_download_mb={MAX_DOWNLOAD_MB}")
+        spool.write(chunk)
+    spool.seek(0)
+    return spool, size
+
+
+def _recording(chunks, received, sink=None):
+    # Pass body chunks through, adding their size to received[0] and keeping them in `sink`
+    # (only when the body is going to be cached)
+    for chunk in chunks:
+        received[0] += len(chunk)
+        if sink is not None:
+            sink.append(chunk)
+        yield chunk
+
+
+class LinkResult:
+    """
+    Outcome of fetching and scoring one result link. `change` is 'new', 'changed' or
+    'unchanged' against the customer's stored results, or 'error' when the fetch failed.
+    """
+    __slots__ = ('link', 'status_code', 'status_text', 'elapsed', 'sentiment_score', 'risk_score', 'cached',
+                 'error', 'change', 'content_hash', 'etag', 'last_modified', 'languages')
+
+    def __init__(self, link, change='new'):
+        self.link = link
+        self.status_code = None
+        self.status_text = None
+        self.elapsed = None
+        self.sentiment_score = None
+        self.risk_score = None
+        self.cached = False
+        self.error = None
+        self.change = change
+        self.content_hash = None
+        self.etag = None
+        self.last_modified = None
+        self.languages = []
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _file_digest(document):
+    # Content hash of a spooled download, read back in chunks
+    digest = hashlib.sha256()
+    document.seek(0)
+    for chunk in iter(lambda: document.read(64 * 1024), b''):
+        digest.update(chunk)
+    document.seek(0)
+    return digest.hexdigest()
+
+
+def _reuse_previous(result, previous, kind):
+    # The document hasn't changed since it was last screened: keep its stored scores
+    result.change = 'unchanged'
+    result.sentiment_score = previous['sentiment_score']
+    result.risk_score = previous['risk_score']
+    count_event('unchanged_documents', kind)
+
+
+def process_link(link, previous=None, matcher=None, attempt=0, defer_retries=False, host_slot=None):
+    """
+    Fetch, extract and score a single result link; text that `matcher` rejects isn't scored.
+    `previous` is the link's stored result from an earlier screening of the same customer: the
+    fetch is then conditional, and a document whose content hash is unchanged isn't scored again.
+    With `defer_retries` a retryable failure raises RetryLater rather than sleeping, and `host_slot`
+    is a slot of the link's host already taken for it (see submit_link()).
+    Runs on a fetch worker thread, so it must not touch any Tk widget.
+    """
+    result = LinkResult(link, 'new' if previous is None else 'changed')
+    try:
+        response, slot = fetch_link(link, previous, attempt, defer_retries, host_slot)
+        try:
+            status_code = response.status_code
+            try:
+                status_text = HTTPStatus(status_code).phrase
+            except ValueError:
+                status_text = "Unknown Status Code"
+
+            result.status_code = status_code
+            result.status_text = status_text
+            result.elapsed = response.elapsed
+            result.cached = getattr(response, 'from_cache', False)
+            result.etag = response.headers.get('ETag')
+            result.last_modified = response.headers.get('Last-Modified')
+
+            if response.status_code == 304 and previous is not None:
+                result.content_hash = previous['content_hash']
+                _reuse_previous(result, previous, 'not_modified')
+                if result.sentiment_score is None:
+                    raise NoMentions("unchanged, no mention of the customer or keywords")
+            elif response.status_code == 200:
+                content_type = response.headers.get('Content-Type', '')
+                link_lower = link.lower()
+                body = None
+
+                if '.pdf' in link_lower or 'application/pdf' in content_type:
+                    document_kind = 'pdf'
+                elif '.docx' in link_lower or 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' in content_type:
+                    document_kind = 'docx'
+                else:
+                    document_kind = None
+
+                _check_download_headers(response, content_type)
+
+                if document_kind:
+                    with stage_timer('download'):
+                        document, size = _spool_document(response.iter_content())
+                    # Downloaded: the host's slot isn't needed while the document is scored
+                    if slot:
+                        slot.release()
+                    if not result.cached:
+                        count_event('bytes_downloaded', amount=size)
+                    with document:
+                        result.content_hash = _file_digest(document)
+                        if previous is not None and previous['content_hash'] == result.content_hash:
+                            _reuse_previous(result, previous, 'same_content')
+                        else:
+                            result.sentiment_score = score_document(document_kind, document, size, matcher)
+                        # Only documents small enough to stay in memory are cached
+                        if size <= DOCUMENT_SPOOL_MB * 1024 * 1024:
+                            document.seek(0)
+                            body = document.read()
+                else:
+                    # HTML bodies are cached only up to where extraction stopped reading; without
+                    # the cache nothing is kept beyond the chunk being parsed
+                    chunks = [] if get_response_cache() and not result.cached else None
+                    received = [0]
+                    with stage_timer('extract'):
+                        text_content = extract_text_from_html(
+                            _recording(_capped(response.iter_content(), _max_download_bytes()), received, chunks),
+                            response_encoding(response.headers)
+                        )
+                    result.content_hash = hashlib.sha256(text_content.encode('utf-8')).hexdigest()
+                    if previous is not None and previous['content_hash'] == result.content_hash:
+                        _reuse_previous(result, previous, 'same_content')
+                    else:
+                        result.sentiment_score = score_text(text_content, matcher)
+                    if chunks is not None:
+                        body = b''.join(chunks)
+                    if not result.cached:
+                        count_event('bytes_downloaded', amount=received[0])
+
+                cache = get_response_cache()
+                if cache and body is not None and not result.cached:
+                    cache.put('url:' + link, status_code, content_type, body)
+
+                if result.sentiment_score is None:
+                    raise NoMentions("no mention of the customer or keywords")
+                if result.change != 'unchanged':
+                    result.risk_score = calculate_risk_score(result.sentiment_score)
+            else:
+                count_event('errors', 'http_status')
+                result.change = 'error'
+        finally:
+            response.close()
+            if slot:
+                slot.release()
+
+    except RetryLater:
+        raise
+    except NoMentions as e:
+        # Not an error: the document was read and hashed, so it is stored and revalidated next time
+        count_event('prefiltered')
+        result.error = f'Skipping link ({e}): {link}'
+    except DocumentSkipped as e:
+        count_event('errors', 'skipped')
+        result.change = 'error'
+        result.error = f'Skipping link ({e}): {link}'
+    except curl_requests.errors.RequestsError as e:
+        count_event('errors', 'circuit_open' if isinstance(e, CircuitOpenError) else 'request')
+        result.change = 'error'
+        result.error = f'Skipping link (request failed): {link}\nError: {str(e)}'
+    except Exception as e:
+        count_event('errors', 'unexpected')
+        result.change = 'error'
+        result.error = f'Skipping link (unexpected error): {link}\nError: {str(e)}'
+
+    count_event('links')
+    return result
+
+
+def report_link_result(result, on_message=None):
+    link = result.link
+    print(f"Currently Processesed Link: {link}")
+
+    if result.status_code is not None:
+        print(f"Status Code: {result.status_code} - {result.status_text}")
+        print(f"Response Time: {result.elapsed:.2f}s")
+        _notify(on_message, f"{result.status_code}, {result.status_text}, {result.elapsed:.2f}s")
+
+    if result.error:
+        message = result.error
+    elif result.risk_score is not None:
+        message = (
+            f'Link: {link}\n'
+            f'Sentiment Score: {result.sentiment_score}\n'
+            f'Risk Score: {result.risk_score}\n'
+        )
+        if result.change == 'unchanged':
+            # Already reported by an earlier screening of this customer
+            message += 'Unchanged since last screening\n'
+    else:
+        message = f'Skipping link (HTTP {result.status_code}): {link}'
+
+    print(message)
+    _notify(on_message, message)
+
+    print('\n====================')
+    _notify(on_message, '\n====================')
+
+
+class ScreeningRun:
+    """
+    One customer's screening. Each reported LinkResult is passed to `writer` (a ReportWriter)
+    and only kept in `results` with `keep_results`; otherwise just the counts and the new or
+    changed high risk links stay in memory, however many customers a session screens.
+    """
+
+    def __init__(self, customer, writer=None, keep_results=False):
+        self.customer = customer
+        self.writer = writer
+        self.results = [] if keep_results else None
+        self.links = 0
+        self.risk_counts = {}
+        self.changes = {}
+        self.high_risk_links = []
+        self.very_high_risk_links = []
+        self.cancelled = False
+        self.errors = []  # Failed search requests: the run may have missed results
+
+    def add(self, result):
+        self.links += 1
+        self.changes[result.change] = self.changes.get(result.change, 0) + 1
+        if result.risk_score is not None:
+            self.risk_counts[result.risk_score] = self.risk_counts.get(result.risk_score, 0) + 1
+            # Unchanged links were already reported by an earlier screening of this customer
+            if result.change != 'unchanged':
+                if result.risk_score == "High Risk":
+                    self.high_risk_links.append(result.link)
+                elif result.risk_score == "Very High Risk":
+                    self.very_high_risk_links.append(result.link)
+        if self.writer is not None:
+            self.writer.write(self.customer, result)
+        if self.results is not None:
+            self.results.append(result)
+
+    def to_dict(self):
+        summary = {
+            'customer': self.customer,
+            'links': self.links,
+            'risk_counts': self.risk_counts,
+            'changes': self.changes,
+            'high_risk_links': self.high_risk_links,
+            'very_high_risk_links': self.very_high_risk_links,
+            'cancelled': self.cancelled,
+            'errors': self.errors,
+        }
+        if self.results is not None:
+            summary['results'] = [result.to_dict() for result in self.results]
+        return summary
+
+
+class ReportWriter:
+    """
+    Appends one row per reported link to a JSONL report, or CSV when `path` ends in .csv,
+    flushing each row as it is written. Safe to share between threads.
+    """
+    FIELDS = ('customer', 'link', 'status_code', 'elapsed', 'sentiment_score', 'risk_score', 'change',
+              'languages', 'cached', 'error')
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._csv = path.lower().endswith('.csv')
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        if self._csv:
+            self._writer = csv.writer(self._file)
+            if new_file:
+                self._writer.writerow(self.FIELDS)
+                self._file.flush()
+
+    def write(self, customer, result):
+        row = {'customer': customer}
+        for field in self.FIELDS[1:]:
+            row[field] = getattr(result, field)
+        with self._lock:
+            if self._csv:
+                row['languages'] = ';'.join(row['languages'])
+                self._writer.writerow([row[field] for field in self.FIELDS])
+            else:
+                self._file.write(json.dumps(row, default=str) + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _notify(callback, *args):
+    if callback:
+        callback(*args)
+
+
+def _wait_for_result(future, cancel_event=None):
+    """
+    Wait for `future`, returning None as soon as `cancel_event` is set.
+    """
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        try:
+            return future.result(timeout=0.1)
+        except FutureTimeoutError:
+            continue
+
+
+@functools.lru_cache(maxsize=32)
+def _keyword_pattern(keywords):
+    # Built once per keyword configuration; longest first so "money laundering" wins over "money".
+    # Only the start is anchored to a word boundary, so "fraud" also matches "fraudulent"
+    alternatives = sorted({r'\s+'.join(map(re.escape, keyword.split())) for keyword in keywords if keyword.strip()},
+                          key=len, reverse=True)
+    return r'(?<!\w)(?:' + '|'.join(alternatives) + ')' if alternatives else None
+
+
+class KeywordMatcher:
+    """
+    Precompiled single-regex matcher for a customer name and the risk keywords of a run.
+    find() collects every hit in one pass over the text; accepts() applies `keyword_prefilter`.
+    Instances pickle to the scoring processes with their compiled pattern.
+    """
+
+    def __init__(self, customer_name, keywords, require=None):
+        self.require = KEYWORD_PREFILTER if require is None else require
+        alternatives = []
+        name_pattern = r'\s+'.join(map(re.escape, customer_name.split()))
+        if name_pattern:
+            alternatives.append(rf'(?P<name>(?<!\w){name_pattern}(?!\w))')
+        keyword_pattern = _keyword_pattern(tuple(keywords))
+        if keyword_pattern:
+            alternatives.append(f'(?P<keyword>{keyword_pattern})')
+        self.pattern = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+    def find(self, text):
+        """
+        Return the (start, end, kind) of every name and keyword hit in `text`; kind is 'name' or 'keyword'.
+        """
+        if self.pattern is None:
+            return []
+        return [(match.start(), match.end(), match.lastgroup) for match in self.pattern.finditer(text)]
+
+    def accepts(self, hits):
+        if self.require == 'off':
+            return True
+        kinds = {kind for _, _, kind in hits}
+        if self.require == 'name':
+            return 'name' in kinds
+        if self.require == 'name_and_keyword':
+            return {'name', 'keyword'} <= kinds
+        return bool(kinds)
+
+
+def validate_customer_name(customer_name):
+    """
+    Return an error message if `customer_name` can't be screened, otherwise None.
+    """
+    if not customer_name or not customer_name.strip() or len(customer_name.strip()) < NAME_MIN_LENGTH:
+        return f"Please enter a customer name with at least {NAME_MIN_LENGTH} characters before searching."
 
     # Only allow letters, numbers, and spaces
     if not re.match(r'^[\w\s]+$', customer_name.strip()):
-        messagebox.showwarning("Input Error", "Customer name must not contain special characters.")
-        return
+        return "Customer name must not contain special characters."
+
+    return None
+
+
+def build_search_query(customer_name, keywords, excluded_sites):
+    excluded_sites_query = ' '.join([f'-site:{site}' for site in excluded_sites])
+    excluded_keywords_query = ' OR '.join([f'{keyword}' for keyword in keywords])
+
+    return f'"{customer_name}" {excluded_keywords_query} {excluded_sites_query}'
+
+
+_page_executor = None
+_fetch_executor = None
+_executors_lock = threading.Lock()
+
+
+def get_page_executor():
+    """
+    Return the shared thread pool requesting search result pages.
+    """
+    global _page_executor
+    if _page_executor is None:
+        with _executors_lock:
+            if _page_executor is None:
+                _page_executor = ThreadPoolExecutor(max_workers=max(1, SEARCH_PAGE_WORKERS))
+    return _page_executor
+
+
+def get_fetch_executor():
+    """
+    Return the shared thread pool fetching and scoring result links. Its threads live as long
+    as the process, so their curl handles keep connections and TLS sessions open across screenings.
+    """
+    global _fetch_executor
+    if _fetch_executor is None:
+        with _executors_lock:
+            if _fetch_executor is None:
+                _fetch_executor = ThreadPoolExecutor(max_workers=max(1, FETCH_MAX_WORKERS))
+    return _fetch_executor
+
+
+def submit_link(executor, link, previous=None, matcher=None):
+    """
+    Submit process_link() for `link` to `executor` and return a Future of its LinkResult.
+    The link is only handed to a worker once a slot of its host is free, and a retry waits out
+    its backoff on a timer before it is submitted again, so links waiting for a busy host or
+    backing off don't hold fetch workers that links to other hosts could use. Cancelling the
+    returned Future drops a waiting or queued attempt.
+    """
+    outer = Future()
+    current = [None]
+
+    def attempt(number):
+        if outer.cancelled():
+            return
+        slot = _acquire_host_slot(link, on_free=lambda slot: start(number, slot))
+        if slot is not None and not start(number, slot):
+            slot.release()
+
+    def start(number, slot):
+        if outer.cancelled():
+            return False
+        try:
+            current[0] = executor.submit(process_link, link, previous, matcher, number, True, slot)
+        except RuntimeError as e:
+            # The executor was shut down while the link was waiting
+            _settle(outer, error=e)
+            return False
+        current[0].add_done_callback(lambda future: finished(future, slot))
+        return True
+
+    def finished(future, slot):
+        # process_link() has released the slot, unless it was cancelled before it ran
+        slot.release()
+        if future.cancelled():
+            outer.cancel()
+            return
+        error = future.exception()
+        if isinstance(error, RetryLater):
+            timer = threading.Timer(error.delay, attempt, args=(error.attempt,))
+            timer.daemon = True
+            timer.start()
+        elif error is not None:
+            _settle(outer, error=error)
+        else:
+            _settle(outer, result=future.result())
+
+    def on_outer_done(future):
+        if future.cancelled() and current[0] is not None:
+            current[0].cancel()
+
+    outer.add_done_callback(on_outer_done)
+    attempt(0)
+    return outer
+
+
+def _settle(future, result=None, error=None):
+    # The caller may cancel `future` at any moment; a late result is then dropped
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def search_and_score_with_api(customer_name, languages_keywords, selected_languages, excluded_sites, num_results=TOTAL_RESULTS,
+                              api_key=None, run=None,
+                              on_message=None, on_response=None, on_progress=None, cancel_event=None):
+    """
+    Run the search-fetch-score pipeline for one customer and return its ScreeningRun; without
+    a `run` a new one is created that keeps the per-link results.
+    Display is left to the callbacks: `on_message(text)` receives the analysis log,
+    `on_response(json)` each raw API response and `on_progress(done, total)` the link count,
+    so the pipeline also runs without a UI or on a worker thread. Setting `cancel_event`
+    stops the run before the next link is reported.
+
+    The result pages of all selected languages are requested together and their links merged
+    into one work queue keyed by normalize_url(), so a document found in several languages is
+    fetched and scored once; its result lists every language that matched it.
+
+    With `incremental_screening` each result is checked against the customer's stored results:
+    its `change` is 'new', 'changed' or 'unchanged', and only new or changed links are added to
+    the run's high risk lists.
+    """
+    error = validate_customer_name(customer_name)
+    if error:
+        raise ValueError(error)
 
     if not api_key:
         raise ValueError("API key is required to use the Custom Search API")
 
-    for lang in selected_languages:
+    if run is None:
+        run = ScreeningRun(customer_name.strip(), keep_results=True)
+
+    # Plan every page request up front, in language order. The search request budget is shared
+    # out between the languages, and a language needing fewer pages leaves the rest to the next ones
+    page_jobs = []
+    search_budget = MAX_SEARCH_REQUESTS
+    for index, lang in enumerate(selected_languages):
         keywords = languages_keywords.get(lang)
         if keywords:
             print(f"Searching in {lang} language...")
 
-        excluded_sites_query = ' '.join([f'-site:{site}' for site in excluded_sites])
-        excluded_keywords_query = ' OR '.join([f'{keyword}' for keyword in keywords])
-
-        search_query = f'"{customer_name}" {excluded_keywords_query} {excluded_sites_query}'
+        search_query = build_search_query(customer_name, keywords, excluded_sites)
 
         print(f"Google Search Query: {search_query}")
 
-        search_params = {
-            'cx':  GOOGLE_SEARCH_CX,
-            'key': GOOGLE_SEARCH_API_KEY,
-            'q': search_query,
-            'num': num_results,
+        languages_left = len(selected_languages) - index
+        wanted = plan_search_pages(num_results)
+        pages = plan_search_pages(num_results, -(-max(0, search_budget) // languages_left))
+        if len(pages) < len(wanted):
+            # Reported as an error so batch and service output show the screening as incomplete
+            message = (f'Search request budget (max_search_requests) allows {len(pages)} of '
+                       f'{len(wanted)} result pages for {lang}.')
+            print(message)
+            _notify(on_message, message)
+            run.errors.append(message)
+        search_budget -= len(pages)
+        for start, num in pages:
+            page_jobs.append((lang, {
+                'cx':  GOOGLE_SEARCH_CX,
+                'key': api_key,
+                'q': search_query,
+                'num': num,
+                'start': start,
+            }))
+
+    if not page_jobs:
+        return run
+
+    page_executor = get_page_executor()
+    fetch_executor = get_fetch_executor()
+    fetches = {}
+    fetches_lock = threading.Lock()
+    finished = False
+    store = get_results_store()
+    customer = customer_key(customer_name)
+    keywords = [keyword for lang in selected_languages for keyword in languages_keywords.get(lang) or ()]
+    matcher = KeywordMatcher(customer_name, keywords)
+
+    def start_fetches(data):
+        # Called as soon as any page arrives, and again (idempotently) when it is reported
+        with fetches_lock:
+            if finished:
+                return
+            for item in data.get('items', []):
+                key = normalize_url(item['link'])
+                if key not in fetches:
+                    previous = store.get(customer, key) if store else None
+                    fetches[key] = submit_link(fetch_executor, item['link'], previous, matcher)
+
+    def on_page_done(page_future):
+        try:
+            start_fetches(page_future.result())
+        except Exception:
+            pass  # Reported from the main loop
+
+    # Request all pages of all languages concurrently (served from the cache when still fresh)
+    page_futures = []
+    for lang, search_params in page_jobs:
+        page_future = page_executor.submit(search_page, search_params)
+        page_future.add_done_callback(on_page_done)
+        page_futures.append(page_future)
+
+    # Report pages in plan order, and each unique document at its first position, for deterministic output
+    languages_by_key = {}
+    exhausted_languages = set()
+    links_done = 0
+    links_total = 0
+    cancelled = False
+    try:
+        for (lang, _), page_future in zip(page_jobs, page_futures):
+            if lang in exhausted_languages:
+                continue
+            try:
+                data = _wait_for_result(page_future, cancel_event)
+            except curl_requests.errors.RequestsError as e:
+                # The run goes on with the other pages, but is marked as incomplete
+                message = f'Search request failed ({lang}): {str(e)}'
+                print(message)
+                _notify(on_message, message)
+                run.errors.append(message)
+                continue
+            if data is None:
+                cancelled = True
+                break
+
+            _notify(on_response, data)
+
+            if 'items' not in data:
+                print(f'No more search results found ({lang}).')
+                exhausted_languages.add(lang)
+                continue
+
+            start_fetches(data)
+            new_keys = []
+            for item in data['items']:
+                key = normalize_url(item['link'])
+                if key not in languages_by_key:
+                    languages_by_key[key] = []
+                    new_keys.append(key)
+                # The list is shared with the document's result, so later matches still show up in it
+                if lang not in languages_by_key[key]:
+                    languages_by_key[key].append(lang)
+            links_total += len(new_keys)
+            _notify(on_progress, links_done, links_total)
+
+            for key in new_keys:
+                result = _wait_for_result(fetches[key], cancel_event)
+                if result is None:
+                    cancelled = True
+                    break
+                result.languages = languages_by_key[key]
+                # Scored and prefiltered documents are stored; failed fetches keep their previous entry
+                if store and result.content_hash is not None and result.change != 'error':
+                    store.record(customer, key, result)
+                report_link_result(result, on_message)
+                run.add(result)
+                links_done += 1
+                _notify(on_progress, links_done, links_total)
+            if cancelled:
+                break
+        run.cancelled = cancelled
+    finally:
+        # On cancel, drop this run's queued pages and links and let in-flight requests finish in the background
+        with fetches_lock:
+            finished = True
+        for future in page_futures + list(fetches.values()):
+            future.cancel()
+        count_event('screenings')
+        export_metrics()
+
+    return run
+
+
+def load_screening_config():
+    """
+    Return (languages_keywords, default_selected_languages, excluded_sites) from config.json.
+    """
+    try:
+        with open('config.json', 'r', encoding='utf-8') as config_file:
+            config = json.load(config_file)
+            return config['languages_keywords'], config['default_selected_languages'], config['excluded_sites']
+    except FileNotFoundError:
+        print("Config file not found. Using default values.")
+        languages_keywords = {
+            'English': ['bribery', 'fraud', 'money laundering', 'crime', 'terrorism', 'corruption']
         }
+        return languages_keywords, ['English'], ['facebook.*']
 
-        api_url = 'https://www.googleapis.com/customsearch/v1'
 
-        # Use curl_cffi requests for the API call
-        response = curl_requests.get(api_url, params=search_params, timeout=CONNECT_TIMEOUT + READ_TIMEOUT, impersonate=CURL_CFFI_IMPERSONATOR, verify=True)
-        print(str(response.text))
-        display_response_tree(json_tree, response.json())
+def read_customer_names(path):
+    """
+    Read customer names from a CSV (`name`/`customer_name` column, else the first column)
+    or JSONL (`name`/`customer_name`/`customer` key, or a bare string per line) file.
+    """
+    names = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as input_file:
+        if path.lower().endswith(('.jsonl', '.json')):
+            for line in input_file:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    record = record.get('name') or record.get('customer_name') or record.get('customer')
+                if record:
+                    names.append(str(record).strip())
+        else:
+            rows = list(csv.reader(input_file))
+            column = 0
+            if rows:
+                header = [cell.strip().lower() for cell in rows[0]]
+                for key in ('name', 'customer_name', 'customer'):
+                    if key in header:
+                        column = header.index(key)
+                        rows = rows[1:]
+                        break
+            for row in rows:
+                if len(row) > column and row[column].strip():
+                    names.append(row[column].strip())
+    return names
+
+
+def _completed_customers(output_path):
+    """
+    Return the customers already written to `output_path` without an error; customers whose
+    latest line records an error are screened again.
+    A trailing partial line left by a crash is truncated so the file can be appended to.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
 
-        data = response.json()
+    with open(output_path, 'rb+') as output_file:
+        data = output_file.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            output_file.truncate(end)
 
-        if 'items' in data:
-            for item in data['items']:
-                link = item['link']
-                print(f"Currently Processesed Link: {link}")
-                try:
-                    # Use curl_requests for the link fetch
-                    response = curl_requests.get(
-                        link,
-                        timeout=CONNECT_TIMEOUT + READ_TIMEOUT,
-                        impersonate=CURL_CFFI_IMPERSONATOR,
-                        verify=True
-                    )
-
-                    status_code = response.status_code
-                    try:
-                        status_text = HTTPStatus(status_code).phrase
-                    except ValueError:
-                        status_text = "Unknown Status Code"
-
-                    print(f"Status Code: {status_code} - {status_text}")
-                    print(f"Response Time: {response.elapsed:.2f}s")
-                    update_textarea(output_textarea, f"{response.status_code}, {status_text}, {response.elapsed:.2f}s")
-
-                    if response.status_code == 200:
-                        content_type = response.headers.get('Content-Type', '')
-                        link_lower = link.lower()
-                        text_content = ""
-
-                        if '.pdf' in link_lower or 'application/pdf' in content_type:
-                            text_content = extract_text_from_pdf(response.content)
-                        elif '.docx' in link_lower or 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' in content_type:
-                            text_content = extract_text_from_docx(response.content)
-                        else:
-                            text_content = response.text
-                        sentiment_score = calculate_sentiment_score(text_content)
-                        risk_score = calculate_risk_score(sentiment_score)
-
-                        message = (
-                            f'Link: {link}\n'
-                            f'Sentiment Score: {sentiment_score}\n'
-                            f'Risk Score: {risk_score}\n'
-                        )
-                        print(message)
-                        update_textarea(output_textarea, message)
+    for line in data[:end].splitlines():
+        try:
+            record = json.loads(line)
+            if record.get('error'):
+                completed.discard(record['customer'])
+            else:
+                completed.add(record['customer'])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue
+    return completed
+
+
+def run_batch(input_path, output_path, languages_keywords, selected_languages, excluded_sites, api_key=None,
+              report_path=None):
+    """
+    Screen every customer in `input_path` without a UI, appending one JSON summary line per
+    customer to `output_path` and one row per link to the `report_path` report as links finish.
+    Customers already present in the output are skipped, so an interrupted run resumes from
+    the last completed name; customers recorded with an error (e.g. search quota exhausted)
+    are retried.
+    """
+    names = read_customer_names(input_path)
+    completed = _completed_customers(output_path)
+    pending = [name for name in dict.fromkeys(names) if name not in completed]
+    total = len(pending)
+
+    print(f"Batch screening: {len(names)} customers, {len(completed)} already done, {total} to go", file=sys.stderr)
+
+    started = time.monotonic()
+    writer = ReportWriter(report_path) if report_path else None
+    with open(output_path, 'a', encoding='utf-8') as output_file:
+        for done, name in enumerate(pending, start=1):
+            run = ScreeningRun(name, writer)
+            error = None
+            try:
+                search_and_score_with_api(name, languages_keywords, selected_languages, excluded_sites,
+                                          api_key=api_key, run=run)
+            except Exception as e:
+                error = str(e)
+            if error is None and run.errors:
+                error = '; '.join(run.errors)
+
+            record = run.to_dict()
+            record['error'] = error
+            output_file.write(json.dumps(record, default=str) + '\n')
+            output_file.flush()
+
+            elapsed_minutes = (time.monotonic() - started) / 60
+            rate = done / elapsed_minutes if elapsed_minutes > 0 else 0.0
+            print(f"[{done}/{total}] {name} - {rate:.1f} customers/min", file=sys.stderr)
+    if writer is not None:
+        writer.close()
+
+
+class ServiceBusy(Exception):
+    """
+    Raised when the screening service's job queue is full.
+    """
 
-                        if risk_score == "High Risk":
-                            high_risk_links.append(link)
-                        elif risk_score == "Very High Risk":
-                            very_high_risk_links.append(link)
-                    else:
-                        message = f'Skipping link (HTTP {response.status_code}): {link}'
-                        print(message)
-                        update_textarea(output_textarea, message)
-
-                except curl_requests.errors.RequestsError as e:
-                    message = f'Skipping link (request failed): {link}\nError: {str(e)}'
-                    print(message)
-                    update_textarea(output_textarea, message)
-                except Exception as e:
-                    message = f'Skipping link (unexpected error): {link}\nError: {str(e)}'
-                    print(message)
-                    update_textarea(output_textarea, message)
-                finally:
-                    print('\n====================')
-                    update_textarea(output_textarea, '\n====================')
+
+class ScreeningService:
+    """
+    Runs screenings for the HTTP service on `workers` threads fed by a queue of at most
+    `queue_size` jobs. A request for a customer and languages that is already queued or
+    running shares that job's result instead of starting another pipeline run.
+    """
+
+    def __init__(self, languages_keywords, default_languages, excluded_sites, api_key, workers, queue_size,
+                 writer=None):
+        self.languages_keywords = languages_keywords
+        self.writer = writer
+        self.default_languages = default_languages
+        self.excluded_sites = excluded_sites
+        self.api_key = api_key
+        self.workers = max(1, workers)
+        self.running = 0
+        self._jobs = queue.Queue(maxsize=max(1, queue_size))
+        self._inflight = {}
+        self._lock = threading.Lock()
+        for _ in range(self.workers):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def submit(self, customer_name, languages=None):
+        """
+        Queue a screening and return a Future of its result.
+        Raises ValueError for an invalid request and ServiceBusy when the queue is full.
+        """
+        error = validate_customer_name(customer_name)
+        if error:
+            raise ValueError(error)
+        languages = list(dict.fromkeys(languages or self.default_languages))
+        unknown = [language for language in languages if language not in self.languages_keywords]
+        if unknown:
+            raise ValueError(f"Unknown languages: {', '.join(unknown)}")
+
+        key = (customer_key(customer_name), tuple(sorted(languages)))
+        with self._lock:
+            job = self._inflight.get(key)
+            if job is not None:
+                count_event('service_requests', 'coalesced')
+                return job
+            job = Future()
+            try:
+                self._jobs.put_nowait((key, customer_name.strip(), languages, job))
+            except queue.Full:
+                count_event('service_requests', 'rejected')
+                raise ServiceBusy(f"Screening queue is full ({self._jobs.maxsize} jobs), retry later")
+            self._inflight[key] = job
+        count_event('service_requests', 'accepted')
+        return job
+
+    def status(self):
+        with self._lock:
+            return {'status': 'ok', 'queued': self._jobs.qsize(), 'running': self.running,
+                    'workers': self.workers, 'queue_size': self._jobs.maxsize}
+
+    def _work(self):
+        while True:
+            key, customer_name, languages, job = self._jobs.get()
+            with self._lock:
+                self.running += 1
+            outcome = error = None
+            try:
+                run = ScreeningRun(customer_name, self.writer, keep_results=True)
+                search_and_score_with_api(customer_name, self.languages_keywords, languages, self.excluded_sites,
+                                          api_key=self.api_key, run=run)
+                outcome = run.to_dict()
+                outcome['languages'] = languages
+            except Exception as e:
+                error = e
+            with self._lock:
+                # Later requests for the customer start a fresh screening
+                self._inflight.pop(key, None)
+                self.running -= 1
+            if error is not None:
+                job.set_exception(error)
+            else:
+                job.set_result(outcome)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/JSON front end of a ScreeningService (the server's `service` attribute):
+    POST /screen {"customer": ..., "languages": [...]} runs a screening and returns its results,
+    GET /health reports the queue and GET /metrics the Prometheus pipeline metrics.
+    """
+    protocol_version = 'HTTP/1.1'  # Keep-alive for the calling backend
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self._send_json(200, self.server.service.status())
+        elif path == '/metrics':
+            self._send(200, 'text/plain; version=0.0.4', METRICS.to_prometheus().encode('utf-8'))
         else:
-            print('No search results found.')
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/screen':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length) or b'{}')
+            customer_name = request.get('customer') or request.get('customer_name') or ''
+            job = self.server.service.submit(str(customer_name), request.get('languages'))
+        except ServiceBusy as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '5'})
+            return
+        except (ValueError, AttributeError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
 
+        try:
+            self._send_json(200, job.result(timeout=SERVICE_REQUEST_TIMEOUT))
+        except FutureTimeoutError:
+            self._send_json(504, {'error': f"Screening still running after {SERVICE_REQUEST_TIMEOUT}s"})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, 'application/json', json.dumps(payload, default=str).encode('utf-8'), headers)
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run_service(host, port, languages_keywords, selected_languages, excluded_sites, api_key=None):
+    """
+    Serve screenings over HTTP until interrupted. The analyzer, HTTP session and worker
+    pools are loaded once up front and shared by every request.
+    """
+    if not api_key:
+        raise ValueError("API key is required to use the Custom Search API")
+    get_sentiment_analyzer()
+    get_http_session()
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.daemon_threads = True
+    server.service = ScreeningService(languages_keywords, selected_languages, excluded_sites, api_key,
+                                      SERVICE_WORKERS, SERVICE_QUEUE_SIZE,
+                                      ReportWriter(REPORT_PATH) if REPORT_PATH else None)
+    print(f"Screening service listening on http://{host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Scoring processes in the PyInstaller build
+
+    parser = argparse.ArgumentParser(description="Negative News Search and Analysis Tool")
+    parser.add_argument('--batch', metavar='CUSTOMERS', help="Screen the names in a CSV/JSONL file without the GUI")
+    parser.add_argument('--output', metavar='RESULTS', default='results.jsonl', help="JSONL file batch results are appended to")
+    parser.add_argument('--report', metavar='REPORT', default=REPORT_PATH,
+                        help="JSONL/CSV file batch link results are appended to (default: report_path)")
+    parser.add_argument('--languages', nargs='+', help="Languages to search in batch mode (default: default_selected_languages)")
+    parser.add_argument('--serve', action='store_true', help="Run the HTTP/JSON screening service instead of the GUI")
+    parser.add_argument('--host', default=SERVICE_HOST, help="Service listen address (default: service_host)")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="Service port (default: service_port)")
+    args = parser.parse_args()
+
     customer_name = ''
 
     # Load configuration from JSON file
-    try:
-        with open('config.json', 'r', encoding='utf-8') as config_file:
-            config = json.load(config_file)
-            languages_keywords = config['languages_keywords']
-            selected_languages = config['default_selected_languages']
-            excluded_sites = config['excluded_sites']
-    except FileNotFoundError:
-        print("Config file not found. Using default values.")
-        languages_keywords = {
-            'English': ['bribery', 'fraud', 'money laundering', 'crime', 'terrorism', 'corruption']
-        }
-        selected_languages = ['English']
-        excluded_sites = ['facebook.*']
+    languages_keywords, selected_languages, excluded_sites = load_screening_config()
+
+    if args.batch:
+        run_batch(args.batch, args.output, languages_keywords, args.languages or selected_languages, excluded_sites,
+                  api_key=GOOGLE_SEARCH_API_KEY, report_path=args.report)
+        sys.exit(0)
+
+    if args.serve:
+        run_service(args.host, args.port, languages_keywords, args.languages or selected_languages, excluded_sites,
+                    api_key=GOOGLE_SEARCH_API_KEY)
+        sys.exit(0)
 
-    high_risk_links = []
-    very_high_risk_links = []
     language_checkboxes = {}
+    report_writer = ReportWriter(REPORT_PATH) if REPORT_PATH else None
+
+    # Screening runs on a worker thread which posts (kind, payload) events for the Tk loop to drain
+    events = queue.Queue()
+    screening = {'thread': None, 'cancel_event': None, 'started': None}
 
     def copy_item():
         selected_items = json_tree.selection()
@@ -321,24 +2428,92 @@ if __name__ == '__main__':
     def command():
         customer_name = customer_name_entry.get()
 
+        error = validate_customer_name(customer_name)
+        if error:
+            messagebox.showwarning("Input Error", error)
+            return
+
+        if screening['thread'] is not None:
+            return
+
         # Populate selected_languages based on checkbox states
         selected_languages = [language for language, var in language_checkboxes.items() if var.get() == 1]
 
-        search_and_score_with_api(customer_name, languages_keywords, selected_languages, excluded_sites,
-                                  api_key=GOOGLE_SEARCH_API_KEY,
-                                  high_risk_links=high_risk_links,
-                                  very_high_risk_links=very_high_risk_links)
+        screening['cancel_event'] = threading.Event()
+        screening['started'] = time.monotonic()
+        screening['thread'] = threading.Thread(target=run_screening,
+                                               args=(customer_name, selected_languages, screening['cancel_event']),
+                                               daemon=True)
+        search_button.config(state=tk.DISABLED)
+        cancel_button.config(state=tk.NORMAL)
+        status_var.set(f"Screening {customer_name}...")
+        response_view.clear()
+        screening['thread'].start()
+        window.after(100, drain_events)
+
+    def run_screening(customer_name, selected_languages, cancel_event):
+        # Worker thread: never touch Tk widgets here, only post events for drain_events()
+        run = ScreeningRun(customer_name.strip(), report_writer)
+        try:
+            search_and_score_with_api(customer_name, languages_keywords, selected_languages, excluded_sites,
+                                      api_key=GOOGLE_SEARCH_API_KEY, run=run,
+                                      on_message=lambda message: events.put(('message', message)),
+                                      on_response=lambda data: events.put(('response', data)),
+                                      on_progress=lambda done, total: events.put(('progress', (done, total))),
+                                      cancel_event=cancel_event)
+        except Exception as e:
+            events.put(('error', str(e)))
+        finally:
+            events.put(('done', run))
+
+    def cancel_command():
+        if screening['cancel_event'] is not None:
+            screening['cancel_event'].set()
+            cancel_button.config(state=tk.DISABLED)
+            status_var.set("Cancelling...")
 
+    def drain_events():
+        try:
+            while True:
+                kind, payload = events.get_nowait()
+                if kind == 'message':
+                    update_textarea(output_textarea, payload)
+                elif kind == 'response':
+                    # Only a top-level node per page; its content is inserted when expanded
+                    response_view.add(payload, search_response_label(payload))
+                elif kind == 'progress':
+                    done, total = payload
+                    elapsed = time.monotonic() - screening['started']
+                    rate = done / elapsed if elapsed > 0 else 0.0
+                    status_var.set(f"Links {done}/{total} - {rate:.2f} links/s")
+                elif kind == 'error':
+                    messagebox.showerror("Search Error", payload)
+                elif kind == 'done':
+                    finish_screening(payload)
+                    return
+        except queue.Empty:
+            pass
+        window.after(100, drain_events)
+
+    def finish_screening(run):
+        cancelled = screening['cancel_event'].is_set()
+        screening['thread'] = None
+        screening['cancel_event'] = None
+        search_button.config(state=tk.NORMAL)
+        cancel_button.config(state=tk.DISABLED)
+        status_var.set("Cancelled" if cancelled else f"Done - {status_var.get()}")
+
+        # Only this run's new or changed links, each opened once
         print("High Risk Links:")
         update_textarea(output_textarea, "High Risk Links:\n")
-        for link in high_risk_links:
+        for link in run.high_risk_links:
             print(link)
             update_textarea(output_textarea, link)
             webbrowser.open(link)  # Open high risk link in browser
 
         print("\nVery High Risk Links:")
         update_textarea(output_textarea, "Very High Risk Links:\n")
-        for link in very_high_risk_links:
+        for link in run.very_high_risk_links:
             print(link)
             update_textarea(output_textarea, link)
             webbrowser.open(link)  # Open very high risk link in browser
@@ -398,10 +2573,15 @@ if __name__ == '__main__':
             col = 0
             row += 1
     
-    # Search button
-    search_button = ttk.Button(input_frame, text="Search and Analyze", 
+    # Search and cancel buttons
+    button_frame = ttk.Frame(input_frame)
+    button_frame.pack(pady=10)
+    search_button = ttk.Button(button_frame, text="Search and Analyze", 
                               command=command, style='TButton')
-    search_button.pack(pady=10)
+    search_button.pack(side=tk.LEFT, padx=5)
+    cancel_button = ttk.Button(button_frame, text="Cancel", command=cancel_command,
+                               style='TButton', state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT, padx=5)
     
     # Results section
     results_frame = ttk.LabelFrame(main_frame, text="Search Results", padding="10")
@@ -434,6 +2614,7 @@ if __name__ == '__main__':
     
     # Configure columns width
     json_tree.column("#0", width=500)
+    response_view = JsonTreeView(json_tree)
     
     # Bind right-click event
     json_tree.bind("<Button-3>", lambda event: json_tree_popup(event))
@@ -5,8 +5,8 @@ a = Analysis(
     ['C:\\Users\\bigwiz\\PycharmProjects\\negative-news\\app.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=[],
+    datas=[('C:\\Users\\bigwiz\\PycharmProjects\\negative-news\\nltk_data', 'nltk_data')],
+    hiddenimports=['PyPDF2', 'docx'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
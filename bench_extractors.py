@@ -0,0 +1,83 @@
+import time
+from io import BytesIO
+
+import docx
+
+import app
+
+# Extraction benchmark over synthetic DOCX and PDF fixtures of growing size. With the page,
+# paragraph and character limits lifted, time per paragraph/page should stay flat (linear scaling).
+SIZES = [500, 1000, 2000, 4000]
+SENTENCE = "The regulator alleges fraud and money laundering by the company's former directors."
+
+
+def make_docx(paragraphs):
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"{i}. {SENTENCE}")
+    stream = BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+def make_pdf(pages):
+    # Minimal single-font PDF with one line of text per page
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for i in range(pages):
+        content = f"BT /F1 10 Tf 40 700 Td ({i}. {SENTENCE}) Tj ET".encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    pdf = BytesIO()
+    pdf.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(pdf.tell())
+        pdf.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = pdf.tell()
+    pdf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        pdf.write(b"%010d 00000 n \n" % offset)
+    pdf.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return pdf.getvalue()
+
+
+def legacy_docx(content_bytes):
+    # Pre-generator implementation: re-sums every collected paragraph twice per paragraph
+    document = docx.Document(BytesIO(content_bytes))
+    paragraphs = []
+    for i, para in enumerate(document.paragraphs):
+        if i >= app.DOCX_MAX_PARAGRAPHS or sum(len(p) for p in paragraphs) >= app.MAX_CHARS:
+            break
+        paragraphs.append(para.text)
+        if sum(len(p) for p in paragraphs) >= app.MAX_CHARS:
+            break
+    return "\n".join(paragraphs)[:app.MAX_CHARS]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    app.MAX_CHARS = 10 ** 9
+    app.PDF_MAX_PAGES = 10 ** 9
+    app.DOCX_MAX_PARAGRAPHS = 10 ** 9
+
+    print(f"{'size':>6} {'docx (legacy)':>16} {'docx':>16} {'pdf':>16}   (total ms / us per item)")
+    for size in SIZES:
+        docx_bytes = make_docx(size)
+        pdf_bytes = make_pdf(size)
+        columns = []
+        for function, fixture in ((legacy_docx, docx_bytes), (app.extract_text_from_docx, docx_bytes),
+                                  (app.extract_text_from_pdf, pdf_bytes)):
+            elapsed = timed(function, fixture)
+            columns.append(f"{elapsed * 1000:7.0f} / {elapsed / size * 1e6:5.0f}")
+        print(f"{size:>6} " + " ".join(f"{column:>16}" for column in columns))
@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import app
+from bench_extractors import make_docx, make_pdf
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# End-to-end screening benchmark without network access or API quota: a local server imitates the
+# Custom Search JSON API and serves synthetic HTML/PDF/DOCX documents with configurable latency,
+# error rate and size, and the full search-fetch-score pipeline of app.py is pointed at it.
+CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+ARTICLE = ("<p>{name} was named in a regulator's report alleging fraud, bribery and money laundering. "
+           "The company denies any wrongdoing and says it cooperates fully with the investigation.</p>")
+BOILERPLATE = "<nav><a href='/'>Home</a> <a href='/news'>News</a></nav><script>var tracking = {};</script>"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline end-to-end screening benchmark")
+    parser.add_argument('--customers', type=int, default=20, help="customers to screen")
+    parser.add_argument('--results', type=int, default=10, help="search results per customer (total_results)")
+    parser.add_argument('--languages', type=int, default=1, help="languages searched per customer")
+    parser.add_argument('--latency-ms', type=float, default=50, help="mean document server latency")
+    parser.add_argument('--api-latency-ms', type=float, default=100, help="mean search API latency")
+    parser.add_argument('--error-rate', type=float, default=0.05, help="share of document requests answered with HTTP 500")
+    parser.add_argument('--html-kb', type=int, default=100, help="size of each HTML page")
+    parser.add_argument('--pdf-pages', type=int, default=5, help="pages per PDF")
+    parser.add_argument('--docx-paragraphs', type=int, default=200, help="paragraphs per DOCX")
+    parser.add_argument('--mix', default='6:2:2', help="html:pdf:docx ratio of result documents")
+    parser.add_argument('--fetch-workers', type=int, default=app.FETCH_MAX_WORKERS, help="fetch_max_workers")
+    parser.add_argument('--scoring-processes', type=int, default=0, help="scoring_processes")
+    parser.add_argument('--rescreen', action='store_true', help="screen the customers a second time, as a weekly re-run would")
+    parser.add_argument('--change-rate', type=float, default=0.1, help="share of documents changed before the re-screen")
+    parser.add_argument('--seed', type=int, default=1, help="random seed for latency and errors")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="screen once more with tracemalloc to report peak Python allocations (not timed)")
+    return parser.parse_args()
+
+
+class MockServer:
+    """
+    Local Custom Search API (/customsearch/v1) and document server (/doc/<id>.<kind>).
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.random_lock = threading.Lock()
+        weights = [int(weight) for weight in args.mix.split(':')]
+        self.kinds = [kind for kind, weight in zip(('html', 'pdf', 'docx'), weights) for _ in range(weight)]
+        padding = "<p>Unrelated market commentary about quarterly results and outlook.</p>"
+        html = "<html><head><title>News</title></head><body>" + BOILERPLATE + "<article>" + ARTICLE + "{padding}</article></body></html>"
+        self.html_template = html.replace('{padding}', padding * max(0, args.html_kb * 1024 // len(padding)))
+        self.documents = {'pdf': make_pdf(args.pdf_pages), 'docx': make_docx(args.docx_paragraphs)}
+        self.generation = 0  # Bumped before a re-screen; changes a `change_rate` share of the documents
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _sleep(self, mean_ms):
+        with self.random_lock:
+            delay = mean_ms / 1000 * self.random.uniform(0.5, 1.5)
+        time.sleep(delay)
+
+    def _send(self, handler, status, content_type, body, etag=None):
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        if etag:
+            handler.send_header('ETag', etag)
+        if status != 304:
+            handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        try:
+            handler.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The extractor stopped reading early
+
+    def handle(self, handler):
+        url = urlsplit(handler.path)
+        if url.path == '/customsearch/v1':
+            self._sleep(self.args.api_latency_ms)
+            self._send(handler, 200, 'application/json; charset=UTF-8', json.dumps(self.search(parse_qs(url.query))).encode())
+        elif url.path.startswith('/doc/'):
+            self._sleep(self.args.latency_ms)
+            with self.random_lock:
+                failed = self.random.random() < self.args.error_rate
+            if failed:
+                self._send(handler, 500, 'text/plain', b'Internal Server Error')
+                return
+            doc_id, kind = url.path[len('/doc/'):].rsplit('.', 1)
+            version = self.generation if zlib.crc32(doc_id.encode()) % 1000 < self.args.change_rate * 1000 else 0
+            etag = f'"{doc_id}-{version}"'
+            if handler.headers.get('If-None-Match') == etag:
+                self._send(handler, 304, CONTENT_TYPES[kind], b'', etag)
+                return
+            if kind == 'html':
+                body = self.html_template.replace('{name}', f'Customer (revision {version})').encode()
+            else:
+                body = self.documents[kind]
+            self._send(handler, 200, CONTENT_TYPES[kind], body, etag)
+        else:
+            self._send(handler, 404, 'text/plain', b'Not Found')
+
+    def search(self, query):
+        # Same shape as a Custom Search JSON API response, with deterministic per-query results
+        q = query['q'][0]
+        start = int(query.get('start', ['1'])[0])
+        num = int(query.get('num', ['10'])[0])
+        items = []
+        for position in range(start, start + num):
+            doc_id = zlib.crc32(f'{q}|{position}'.encode()) % 1000000
+            kind = self.kinds[doc_id % len(self.kinds)]
+            link = f'{self.base_url}/doc/{doc_id}.{kind}'
+            items.append({'kind': 'customsearch#result', 'title': f'Result {position}', 'link': link,
+                          'displayLink': '127.0.0.1', 'snippet': 'fraud investigation'})
+        return {
+            'kind': 'customsearch#search',
+            'queries': {'request': [{'searchTerms': q, 'count': num, 'startIndex': start}]},
+            'searchInformation': {'totalResults': str(app.SEARCH_MAX_RESULTS)},
+            'items': items,
+        }
+
+
+def percentile(values, share):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+
+def main():
+    args = parse_args()
+    server = MockServer(args)
+    work_dir = tempfile.mkdtemp(prefix='nnsat-bench-')
+
+    # Point the pipeline at the mock server; no cache so every run does the full work
+    app.GOOGLE_SEARCH_API_URL = server.base_url + '/customsearch/v1'
+    app.GOOGLE_SEARCH_CX = 'bench'
+    app.CACHE_ENABLED = False
+    app.METRICS_JSON_PATH = os.path.join(work_dir, 'metrics.json')
+    app.METRICS_PROMETHEUS_PATH = os.path.join(work_dir, 'metrics.prom')
+    app.FETCH_MAX_WORKERS = args.fetch_workers
+    app.FETCH_PER_HOST_LIMIT = args.fetch_workers  # Every document is served by the one mock host
+    app.SCORING_PROCESSES = args.scoring_processes
+    app.MAX_SEARCH_REQUESTS = len(app.plan_search_pages(args.results)) * args.languages  # Every page of every language
+    app.INCREMENTAL_SCREENING = args.rescreen
+    app.RESULTS_STORE_PATH = os.path.join(work_dir, 'results.sqlite3')
+
+    link_latencies = []
+    process_link = app.process_link
+
+    def timed_process_link(link, *args):
+        start = time.perf_counter()
+        try:
+            return process_link(link, *args)
+        finally:
+            link_latencies.append(time.perf_counter() - start)
+
+    app.process_link = timed_process_link
+
+    languages_keywords = {f'Language{i}': ['fraud', f'keyword{i}'] for i in range(args.languages)}
+    customers = [f'Customer {i:05d}' for i in range(args.customers)]
+
+    app.get_sentiment_analyzer()  # Load the lexicon before timing
+
+    def screen_all():
+        # Returns (links, changes by kind, seconds)
+        started = time.perf_counter()
+        links = 0
+        changes = {}
+        real_stdout = sys.stdout
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull  # The pipeline logs every link to stdout
+            try:
+                for customer in customers:
+                    run = app.search_and_score_with_api(customer, languages_keywords, list(languages_keywords), [],
+                                                        num_results=args.results, api_key='bench',
+                                                        run=app.ScreeningRun(customer))
+                    links += run.links
+                    for change, count in run.changes.items():
+                        changes[change] = changes.get(change, 0) + count
+            finally:
+                sys.stdout = real_stdout
+        return links, changes, time.perf_counter() - started
+
+    def timed_pass(label):
+        # Untraced, so the timings don't include tracemalloc's overhead
+        link_latencies.clear()
+        links, changes, elapsed = screen_all()
+        print(f"{label}:")
+        print(f"  Links scored: {links} in {elapsed:.1f}s ({', '.join(f'{n} {change}' for change, n in sorted(changes.items()))})")
+        print(f"  Throughput: {args.customers / elapsed * 60:.1f} customers/min, {links / elapsed:.1f} links/s")
+        print(f"  Per-link latency: p50 {percentile(link_latencies, 0.5) * 1000:.0f} ms, p95 {percentile(link_latencies, 0.95) * 1000:.0f} ms")
+        if resource:
+            peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+            print(f"  Peak memory: {peak_rss_mb:.0f} MB RSS (process high-water mark)")
+
+    print(f"Customers: {args.customers} x {args.results} results x {args.languages} language(s), mix html:pdf:docx={args.mix}")
+    timed_pass("Screening")
+    if args.rescreen:
+        server.generation = 1
+        timed_pass(f"Re-screening ({args.change_rate:.0%} of documents changed)")
+    if args.trace_memory:
+        # A separate pass, after the timed ones, measures peak Python allocations with tracemalloc
+        tracemalloc.start()
+        screen_all()
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Traced pass: peak {peak_traced / (1024 * 1024):.1f} MB of Python allocations")
+    print(f"Stage metrics: {app.METRICS_JSON_PATH}")
+    server.httpd.shutdown()
+
+
+if __name__ == '__main__':
+    main()
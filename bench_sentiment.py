@@ -0,0 +1,55 @@
+import time
+
+import app
+
+app.get_sentiment_analyzer()  # Make sure the lexicon is available (and loaded once) before timing
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+# Micro-benchmark: per-document scoring latency with a fresh analyzer per call (old behaviour)
+# versus the shared analyzer and the batch API in app.py.
+DOCUMENT_COUNT = 50
+DOCUMENT = (
+    "The company was fined after regulators uncovered fraud and money laundering. "
+    "Executives deny any wrongdoing and say the business remains strong. "
+) * 20
+
+documents = [DOCUMENT] * DOCUMENT_COUNT
+
+
+def per_document_ms(elapsed):
+    return elapsed / DOCUMENT_COUNT * 1000
+
+
+start = time.perf_counter()
+for text in documents:
+    SentimentIntensityAnalyzer().polarity_scores(text)
+before = time.perf_counter() - start
+
+start = time.perf_counter()
+for text in documents:
+    app.calculate_sentiment_score(text)
+shared = time.perf_counter() - start
+
+start = time.perf_counter()
+app.score_texts(documents)
+batch = time.perf_counter() - start
+
+# Sentence-level scoring (scoring_mode=sentences) per aggregation, with its early exit
+app.SCORING_MODE = 'sentences'
+matcher = app.KeywordMatcher('The company', ['fraud', 'money laundering'])
+sentence_modes = {}
+for aggregation in ('max', 'top_k_mean', 'keyword_proximity'):
+    app.SENTENCE_AGGREGATION = aggregation
+    start = time.perf_counter()
+    for text in documents:
+        app.calculate_sentiment_score(text, matcher.find(text))
+    sentence_modes[aggregation] = time.perf_counter() - start
+app.SCORING_MODE = 'document'
+
+print(f"Documents: {DOCUMENT_COUNT} x {len(DOCUMENT)} chars")
+print(f"New analyzer per document: {per_document_ms(before):.2f} ms/doc")
+print(f"Shared analyzer:           {per_document_ms(shared):.2f} ms/doc")
+print(f"Batch score_texts():       {per_document_ms(batch):.2f} ms/doc")
+for aggregation, elapsed in sentence_modes.items():
+    label = f"Sentences ({aggregation}):"
+    print(f"{label:<27}{per_document_ms(elapsed):.2f} ms/doc")
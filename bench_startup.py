@@ -0,0 +1,47 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Startup benchmark: import app.py in a fresh interpreter with `python -X importtime`
+# and report wall-clock time plus the slowest modules by cumulative import time.
+RUNS = 5
+TOP_MODULES = 10
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def import_app():
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                               cwd=APP_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr)
+    return elapsed, completed.stderr
+
+
+timings = []
+report = ''
+for _ in range(RUNS):
+    elapsed, report = import_app()
+    timings.append(elapsed)
+
+modules = []
+for line in report.splitlines():
+    match = IMPORTTIME_LINE.match(line)
+    if match:
+        cumulative_us = int(match.group(2))
+        depth = len(match.group(3)) // 2
+        modules.append((cumulative_us, depth, match.group(4)))
+
+app_us = next((us for us, _, name in modules if name == 'app'), 0)
+timings.sort()
+
+print(f"Interpreter + import app, {RUNS} runs: best {timings[0] * 1000:.0f} ms, median {timings[RUNS // 2] * 1000:.0f} ms")
+print(f"import app (cumulative, last run): {app_us / 1000:.1f} ms")
+print("Slowest direct imports:")
+for cumulative_us, depth, name in sorted((m for m in modules if m[1] == 1), reverse=True)[:TOP_MODULES]:
+    print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
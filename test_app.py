@@ -0,0 +1,651 @@
+"""
+Regression checks for app.py. Run with `python -m pytest -q`.
+"""
+import json
+import pickle
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import app
+
+
+class FakeAnalyzer:
+    """
+    Stand-in for VADER: each sentence's compound score is looked up, and every call is recorded.
+    """
+
+    def __init__(self, compounds):
+        self.compounds = compounds
+        self.scored = []
+
+    def polarity_scores(self, text):
+        self.scored.append(text)
+        return {'compound': self.compounds.get(text, 0.0)}
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    def install(compounds):
+        fake = FakeAnalyzer(compounds)
+        monkeypatch.setattr(app, 'get_sentiment_analyzer', lambda: fake)
+        return fake
+    return install
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    """
+    Run the pipeline without the response cache, the results store or metrics files.
+    """
+    monkeypatch.setattr(app, 'CACHE_ENABLED', False)
+    monkeypatch.setattr(app, 'INCREMENTAL_SCREENING', False)
+    monkeypatch.setattr(app, 'METRICS_ENABLED', False)
+    monkeypatch.chdir(tmp_path)
+
+
+class LocalServer:
+    """
+    Document server on a free local port. `routes` maps a path to a function called with the
+    request headers that returns (status, headers, body); a body given as a list of chunks is sent
+    `latency` apart. Every request is kept in `requests`, and `peak` is the most responses that
+    were in progress at once.
+    """
+    # curl-cffi 0.11.1 deadlocks a streaming GET whose transfer completes before it has
+    # registered its cleanup callback, which only a local server answers fast enough to do
+    latency = 0.02
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        local = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with local._lock:
+                    local.requests.append((self.path, dict(self.headers)))
+                    local.active += 1
+                    local.peak = max(local.peak, local.active)
+                try:
+                    time.sleep(local.latency)
+                    status, headers, body = local.routes[self.path](self.headers)
+                    chunks = body if isinstance(body, list) else [body]
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(sum(map(len, chunks))))
+                    self.end_headers()
+                    for index, chunk in enumerate(chunks):
+                        if index:
+                            time.sleep(local.latency)
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+                finally:
+                    with local._lock:
+                        local.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    local = LocalServer()
+    yield local
+    local.close()
+
+
+def html_page(text, etag=None):
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+    if etag:
+        headers['ETag'] = etag
+    return 200, headers, f'<html><body><article><p>{text}</p></article></body></html>'.encode()
+
+
+# normalize_url
+
+def test_normalize_url_drops_tracking_params_and_sorts_query():
+    assert (app.normalize_url('https://example.com/news?utm_source=x&b=2&gclid=1&a=1&UTM_Medium=y')
+            == app.normalize_url('http://example.com/news?a=1&b=2'))
+    assert app.normalize_url('https://example.com/news?b=2&a=1') == '//example.com/news?a=1&b=2'
+
+
+def test_normalize_url_ignores_default_ports_only():
+    assert app.normalize_url('https://Example.com:443/a') == '//example.com/a'
+    assert app.normalize_url('http://example.com:80/a') == '//example.com/a'
+    assert app.normalize_url('https://example.com:8443/a') == '//example.com:8443/a'
+
+
+def test_normalize_url_ignores_trailing_slash_and_fragment():
+    assert app.normalize_url('https://example.com/a/#top') == app.normalize_url('https://example.com/a')
+    assert app.normalize_url('https://example.com') == '//example.com/'
+
+
+# extract_text_from_html
+
+def test_extract_text_from_html_drops_boilerplate():
+    html = (b'<html><head><title>T</title><style>p {}</style></head><body>'
+            b'<header><nav><a>Home</a></nav>Site name</header><div role="navigation">Menu</div>'
+            b'<script>var fraud = 1;</script><article><p>First &amp; <b>second</b>.</p><p>Third.</p></article>'
+            b'<aside>Related</aside><footer>Copyright</footer></body></html>')
+    assert app.extract_text_from_html([html]) == 'First & second.\nThird.'
+
+
+def test_extract_text_from_html_keeps_form_pages_and_article_headers():
+    # ASP.NET WebForms pages put the whole body in a <form>
+    html = (b'<body><form runat="server"><input name="q"><select><option>All</option></select>'
+            b'<main><article><header><h1>Regulator fines Acme Corp</h1></header><p>For fraud.</p></article></main>'
+            b'</form></body>')
+    assert app.extract_text_from_html([html]) == 'Regulator fines Acme Corp\nFor fraud.'
+
+
+def test_extract_text_from_html_skips_nested_boilerplate_to_its_end():
+    html = b'<aside><aside>Inner</aside>Outer</aside><p>Kept</p>'
+    assert app.extract_text_from_html([html]) == 'Kept'
+
+
+def test_extract_text_from_html_decodes_across_chunks():
+    body = '<p>Société Générale</p>'.encode('utf-8')
+    split = body.index('é'.encode('utf-8')) + 1  # Inside the two bytes of the first é
+    assert app.extract_text_from_html([body[:split], body[split:]]) == 'Société Générale'
+    assert app.extract_text_from_html(['<p>Caf\xe9</p>'.encode('latin-1')], 'latin-1') == 'Caf\xe9'
+
+
+def test_extract_text_from_html_stops_reading_at_max_chars(monkeypatch):
+    monkeypatch.setattr(app, 'MAX_CHARS', 20)
+    read = []
+
+    def chunks():
+        for index in range(100):
+            read.append(index)
+            yield b'<p>0123456789</p>'
+
+    assert app.extract_text_from_html(chunks()) == '0123456789\n0123456789'
+    assert len(read) == 2
+
+
+# plan_search_pages
+
+def test_plan_search_pages_splits_into_pages_of_ten():
+    assert app.plan_search_pages(25) == [(1, 10), (11, 10), (21, 5)]
+    assert app.plan_search_pages(0) == []
+
+
+def test_plan_search_pages_stops_at_the_100th_result():
+    pages = app.plan_search_pages(150)
+    assert len(pages) == 10
+    assert pages[-1] == (91, 10)
+
+
+def test_plan_search_pages_respects_request_budget():
+    assert app.plan_search_pages(50, max_requests=2) == [(1, 10), (11, 10)]
+    assert app.plan_search_pages(50, max_requests=0) == []
+
+
+def test_search_budget_is_shared_between_languages(pipeline, monkeypatch):
+    requested = []
+
+    def search_page(params):
+        requested.append((params['q'].split()[2], params['start']))
+        return {'items': []}
+
+    monkeypatch.setattr(app, 'search_page', search_page)
+    monkeypatch.setattr(app, 'MAX_SEARCH_REQUESTS', 3)
+    messages = []
+    run = app.search_and_score_with_api('Acme Corp', {'English': ['fraud'], 'Spanish': ['fraude']},
+                                        ['English', 'Spanish'], [], num_results=25, api_key='key',
+                                        on_message=messages.append)
+    assert sorted(requested) == [('fraud', 1), ('fraud', 11), ('fraude', 1)]
+    assert run.errors == messages
+    assert [message.split()[-1] for message in run.errors] == ['English.', 'Spanish.']
+
+
+# KeywordMatcher
+
+def test_keyword_matcher_reports_name_and_keyword_hits():
+    matcher = app.KeywordMatcher('Acme  Corp', ['fraud', 'money laundering'], require='any')
+    hits = matcher.find('ACME corp denies money\nlaundering and fraudulent billing.')
+    assert [kind for _, _, kind in hits] == ['name', 'keyword', 'keyword']
+    start, end, _ = hits[1]
+    assert 'ACME corp denies money\nlaundering and fraudulent billing.'[start:end] == 'money\nlaundering'
+
+
+def test_keyword_matcher_name_needs_word_boundaries():
+    matcher = app.KeywordMatcher('Acme', [], require='any')
+    assert matcher.find('Acmeville and NotAcme') == []
+    assert len(matcher.find('(Acme)')) == 1
+
+
+@pytest.mark.parametrize('require, kinds, accepted', [
+    ('any', set(), False),
+    ('any', {'keyword'}, True),
+    ('name', {'keyword'}, False),
+    ('name', {'name'}, True),
+    ('name_and_keyword', {'name'}, False),
+    ('name_and_keyword', {'name', 'keyword'}, True),
+    ('off', set(), True),
+])
+def test_keyword_matcher_prefilter(require, kinds, accepted):
+    matcher = app.KeywordMatcher('Acme', ['fraud'], require=require)
+    assert matcher.accepts([(0, 1, kind) for kind in kinds]) is accepted
+
+
+def test_keyword_matcher_pickles():
+    matcher = pickle.loads(pickle.dumps(app.KeywordMatcher('Acme', ['fraud'], require='name')))
+    assert matcher.require == 'name'
+    assert [kind for _, _, kind in matcher.find('Acme fraud')] == ['name', 'keyword']
+
+
+# score_sentences and calculate_sentiment_score
+
+def test_split_sentences_keeps_offsets():
+    text = 'First one. Second one!\n\nThird'
+    assert app.split_sentences(text) == [(0, 'First one.'), (11, 'Second one!'), (24, 'Third')]
+    assert app.split_sentences('  \n ') == []
+
+
+def test_score_sentences_max(monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'SENTENCE_AGGREGATION', 'max')
+    analyzer({'a': -0.2, 'b': 0.5, 'c': -0.1})
+    assert app.score_sentences(['a', 'b', 'c']) == pytest.approx(0.2)
+    assert app.score_sentences([]) == 0.0
+
+
+def test_score_sentences_top_k_mean(monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'SENTENCE_AGGREGATION', 'top_k_mean')
+    monkeypatch.setattr(app, 'SENTENCE_TOP_K', 2)
+    analyzer({'a': -0.2, 'b': -0.1, 'c': 0.5})
+    assert app.score_sentences(['a', 'b', 'c']) == pytest.approx(0.15)
+
+
+def test_score_sentences_stops_once_very_high_risk(monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'SENTENCE_AGGREGATION', 'max')
+    fake = analyzer({'a': -0.1, 'b': -0.9, 'c': -0.2})
+    assert app.score_sentences(['a', 'b', 'c', 'd']) == pytest.approx(0.9)
+    assert fake.scored == ['a', 'b']
+
+
+def test_score_sentences_keyword_proximity(monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'SENTENCE_AGGREGATION', 'keyword_proximity')
+    analyzer({'a': -0.2, 'b': 0.0, 'c': -0.45})
+    # 'a' mentions a keyword, 'c' is two sentences away from it: 0.2 beats 0.45 / 3
+    assert app.score_sentences(['a', 'b', 'c'], hit_sentences=[0]) == pytest.approx(0.2)
+
+
+def test_score_sentences_keyword_proximity_falls_back_to_top_k_mean(monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'SENTENCE_AGGREGATION', 'keyword_proximity')
+    monkeypatch.setattr(app, 'SENTENCE_TOP_K', 2)
+    analyzer({'a': -0.2, 'b': -0.1})
+    assert app.score_sentences(['a', 'b']) == pytest.approx(0.15)
+
+
+def test_keyword_proximity_ignores_name_hits(monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'SCORING_MODE', 'sentences')
+    monkeypatch.setattr(app, 'SENTENCE_AGGREGATION', 'keyword_proximity')
+    text = 'Acme grew. Bad news here. Acme fraud.'
+    analyzer({'Acme grew.': 0.0, 'Bad news here.': -0.2, 'Acme fraud.': 0.0})
+    matcher = app.KeywordMatcher('Acme', ['fraud'])
+    # Only the keyword in the third sentence counts, one sentence away from the risky one
+    assert app.calculate_sentiment_score(text, matcher.find(text)) == pytest.approx(0.1)
+
+
+# ResponseCache
+
+def test_response_cache_expires_entries(tmp_path):
+    cache = app.ResponseCache(str(tmp_path / 'cache.sqlite3'), ttl_seconds=60, max_bytes=1000)
+    cache.put('url:a', 200, 'text/html', b'body')
+    cached = cache.get('url:a')
+    assert cached.status_code == 200 and cached.content == b'body'
+    cache.ttl_seconds = -1
+    assert cache.get('url:a') is None
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = app.ResponseCache(str(tmp_path / 'cache.sqlite3'), ttl_seconds=60, max_bytes=25)
+    cache.put('a', 200, 'text/html', b'x' * 10)
+    time.sleep(0.01)
+    cache.put('b', 200, 'text/html', b'x' * 10)
+    time.sleep(0.01)
+    assert cache.get('a') is not None  # 'b' is now the least recently used
+    time.sleep(0.01)
+    cache.put('c', 200, 'text/html', b'x' * 10)
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+# ResultsStore
+
+def test_results_store_records_and_updates(tmp_path):
+    store = app.ResultsStore(str(tmp_path / 'results.sqlite3'))
+    customer = app.customer_key('ACME  Corp')
+    assert customer == app.customer_key('acme corp')
+    assert store.get(customer, 'example.com/a') is None
+
+    result = app.LinkResult('https://example.com/a')
+    result.content_hash, result.etag, result.sentiment_score, result.risk_score = 'h1', '"v1"', 0.4, 'Very High Risk'
+    store.record(customer, 'example.com/a', result)
+    stored = store.get(customer, 'example.com/a')
+    assert (stored['content_hash'], stored['etag'], stored['sentiment_score']) == ('h1', '"v1"', 0.4)
+    first_seen = stored['first_seen']
+
+    # An unchanged document keeps its scores and only refreshes its validators and check time
+    unchanged = app.LinkResult('https://example.com/a', 'unchanged')
+    unchanged.etag = '"v2"'
+    store.record(customer, 'example.com/a', unchanged)
+    stored = store.get(customer, 'example.com/a')
+    assert (stored['content_hash'], stored['etag'], stored['sentiment_score']) == ('h1', '"v2"', 0.4)
+    assert stored['last_checked'] >= stored['last_changed']
+
+    changed = app.LinkResult('https://example.com/a', 'changed')
+    changed.content_hash = 'h2'
+    store.record(customer, 'example.com/a', changed)
+    stored = store.get(customer, 'example.com/a')
+    assert (stored['content_hash'], stored['sentiment_score']) == ('h2', None)
+    assert stored['first_seen'] == first_seen
+
+
+def stored(result):
+    return {'content_hash': result.content_hash, 'etag': result.etag, 'last_modified': result.last_modified,
+            'sentiment_score': result.sentiment_score, 'risk_score': result.risk_score}
+
+
+def test_process_link_reuses_stored_result_when_not_modified(pipeline, server, analyzer):
+    server.routes['/a'] = lambda headers: ((304, {'ETag': '"v1"'}, b'') if headers.get('If-None-Match') == '"v1"'
+                                           else html_page('Acme Corp fraud.', etag='"v1"'))
+    matcher = app.KeywordMatcher('Acme Corp', ['fraud'])
+    analyzer({'Acme Corp fraud.': -0.6})
+    first = app.process_link(server.url + '/a', None, matcher)
+    assert (first.change, first.sentiment_score, first.etag) == ('new', pytest.approx(0.6), '"v1"')
+
+    again = app.process_link(server.url + '/a', stored(first), matcher)
+    assert server.requests[-1][1].get('If-None-Match') == '"v1"'
+    assert (again.change, again.status_code, again.error) == ('unchanged', 304, None)
+    assert (again.content_hash, again.sentiment_score, again.risk_score) == (first.content_hash, first.sentiment_score, first.risk_score)
+
+
+def test_process_link_keeps_prefiltered_documents_unchanged(pipeline, server, analyzer):
+    server.routes['/a'] = lambda headers: (304, {}, b'')
+    previous = {'content_hash': 'h', 'etag': '"v1"', 'last_modified': None, 'sentiment_score': None, 'risk_score': None}
+    result = app.process_link(server.url + '/a', previous, app.KeywordMatcher('Acme Corp', ['fraud']))
+    # Stored again as checked, not reported as an error
+    assert (result.change, result.content_hash, result.sentiment_score) == ('unchanged', 'h', None)
+    assert 'no mention' in result.error
+
+
+def test_process_link_doesnt_rescore_same_content(pipeline, server, analyzer):
+    server.routes['/a'] = lambda headers: html_page('Acme Corp fraud.')
+    matcher = app.KeywordMatcher('Acme Corp', ['fraud'])
+    fake = analyzer({'Acme Corp fraud.': -0.6})
+    first = app.process_link(server.url + '/a', None, matcher)
+    scored = len(fake.scored)
+    again = app.process_link(server.url + '/a', stored(first), matcher)
+    assert (again.change, again.sentiment_score) == ('unchanged', first.sentiment_score)
+    assert len(fake.scored) == scored
+
+
+def test_process_link_marks_failed_fetch_as_error(pipeline, server, monkeypatch):
+    monkeypatch.setattr(app, 'MAX_RETRIES', 0)
+    server.routes['/a'] = lambda headers: (503, {}, b'')
+    previous = {'content_hash': 'h', 'etag': '"v1"', 'last_modified': None, 'sentiment_score': 0.5, 'risk_score': 'x'}
+    result = app.process_link(server.url + '/a', previous, None)
+    assert (result.change, result.status_code, result.content_hash) == ('error', 503, None)
+
+
+def test_host_slot_is_held_until_the_download_is_read(pipeline, server, monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'FETCH_PER_HOST_LIMIT', 1)
+    analyzer({})
+    status, headers, body = html_page('Acme Corp fraud.')
+    server.routes['/a'] = server.routes['/b'] = lambda request_headers: (status, headers, [body[:20], body[20:40], body[40:]])
+    threads = [threading.Thread(target=app.process_link, args=(server.url + path,)) for path in ('/a', '/b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(server.requests) == 2
+    assert server.peak == 1
+    assert app._host_slots == {}
+
+
+
+def test_busy_host_doesnt_hold_fetch_workers(pipeline, monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'FETCH_PER_HOST_LIMIT', 1)
+    analyzer({})
+    busy, other = LocalServer(), LocalServer()
+    try:
+        busy.latency = 0.2
+        busy.routes['/a'] = busy.routes['/b'] = busy.routes['/c'] = lambda headers: html_page('Acme Corp fraud.')
+        other.routes['/d'] = lambda headers: html_page('Acme Corp fraud.')
+        executor = ThreadPoolExecutor(max_workers=2)
+        done = []
+        futures = [app.submit_link(executor, busy.url + path) for path in ('/a', '/b', '/c')]
+        futures.append(app.submit_link(executor, other.url + '/d'))
+        for future in futures:
+            future.add_done_callback(lambda future: done.append(future.result().link))
+        for future in futures:
+            assert future.result(timeout=5).status_code == 200
+        # Only one link of the busy host runs at a time, and the others wait without a worker
+        assert busy.peak == 1
+        assert done[:2] == [other.url + '/d', busy.url + '/a']
+        assert app._host_slots == {}
+        executor.shutdown()
+    finally:
+        busy.close()
+        other.close()
+
+
+def failing_then(page, failures):
+    # Answers 503 with a short Retry-After `failures` times, then `page`
+    calls = []
+
+    def route(headers):
+        calls.append(1)
+        if len(calls) <= failures:
+            return 503, {'Retry-After': '0.3'}, b''
+        return page
+    return route
+
+
+def test_submit_link_retries_without_holding_a_worker(pipeline, server, monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'MAX_RETRIES', 2)
+    analyzer({})
+    server.routes['/flaky'] = failing_then(html_page('Acme Corp fraud.'), failures=2)
+    server.routes['/ok'] = lambda headers: html_page('Acme Corp fraud.')
+    executor = ThreadPoolExecutor(max_workers=1)
+    flaky = app.submit_link(executor, server.url + '/flaky')
+    time.sleep(0.1)  # Backing off after its first 503
+    ok = app.submit_link(executor, server.url + '/ok')
+    assert ok.result(timeout=5).status_code == 200
+    assert not flaky.done()
+    result = flaky.result(timeout=5)
+    assert (result.status_code, result.error) == (200, None)
+    assert [path for path, _ in server.requests] == ['/flaky', '/ok', '/flaky', '/flaky']
+    executor.shutdown()
+
+
+def test_submit_link_cancel_drops_the_pending_retry(pipeline, server, monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'MAX_RETRIES', 2)
+    server.routes['/flaky'] = failing_then(html_page('Acme Corp fraud.'), failures=2)
+    executor = ThreadPoolExecutor(max_workers=1)
+    flaky = app.submit_link(executor, server.url + '/flaky')
+    time.sleep(0.1)
+    assert flaky.cancel()
+    time.sleep(0.5)
+    assert len(server.requests) == 1
+    assert app._host_slots == {}
+    executor.shutdown()
+
+
+def test_submit_link_cancel_passes_a_waiting_slot_on(pipeline, server, monkeypatch, analyzer):
+    monkeypatch.setattr(app, 'FETCH_PER_HOST_LIMIT', 1)
+    analyzer({})
+    server.routes['/a'] = server.routes['/b'] = server.routes['/c'] = lambda headers: html_page('Acme Corp fraud.')
+    executor = ThreadPoolExecutor(max_workers=2)
+    first, waiting, last = (app.submit_link(executor, server.url + path) for path in ('/a', '/b', '/c'))
+    assert waiting.cancel()
+    assert first.result(timeout=5).status_code == 200
+    assert last.result(timeout=5).status_code == 200
+    assert [path for path, _ in server.requests] == ['/a', '/c']
+    assert app._host_slots == {}
+    executor.shutdown()
+
+
+# Batch screening
+
+def test_read_customer_names_skips_header_behind_bom(tmp_path):
+    # Excel saves "CSV UTF-8" with a byte order mark
+    path = tmp_path / 'customers.csv'
+    path.write_bytes('id,Name\r\n1,Acme Corp\r\n2,Société Générale\r\n3, \r\n'.encode('utf-8-sig'))
+    assert app.read_customer_names(str(path)) == ['Acme Corp', 'Société Générale']
+    path.write_bytes('Acme Corp\nGlobex\n'.encode('utf-8-sig'))
+    assert app.read_customer_names(str(path)) == ['Acme Corp', 'Globex']
+
+
+def test_read_customer_names_from_jsonl(tmp_path):
+    path = tmp_path / 'customers.jsonl'
+    path.write_bytes('{"customer_name": "Acme Corp"}\n\n"Globex"\n{"customer": "Initech"}\n'.encode('utf-8-sig'))
+    assert app.read_customer_names(str(path)) == ['Acme Corp', 'Globex', 'Initech']
+
+
+def test_completed_customers_uses_latest_line_and_truncates_partial_line(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    lines = [{'customer': 'Acme', 'error': None}, {'customer': 'Globex', 'error': None},
+             {'customer': 'Globex', 'error': 'quota exceeded'}, {'customer': 'Initech', 'error': 'quota exceeded'},
+             {'customer': 'Initech', 'error': None}]
+    complete = ''.join(json.dumps(line) + '\n' for line in lines)
+    path.write_text(complete + '{"customer": "Umbrel', encoding='utf-8')
+    assert app._completed_customers(str(path)) == {'Acme', 'Initech'}
+    assert path.read_text(encoding='utf-8') == complete
+    assert app._completed_customers(str(tmp_path / 'missing.jsonl')) == set()
+
+
+def test_run_batch_resumes_and_retries_errors(pipeline, tmp_path, monkeypatch):
+    input_path, output_path = tmp_path / 'customers.csv', tmp_path / 'out.jsonl'
+    input_path.write_text('name\nAcme Corp\nGlobex\nAcme Corp\n', encoding='utf-8')
+    screened = []
+
+    def search_and_score_with_api(name, *args, run=None, **kwargs):
+        screened.append(name)
+        if name == 'Globex' and screened.count(name) == 1:
+            run.errors.append('Search request failed (English): quota exceeded')
+        return run
+
+    monkeypatch.setattr(app, 'search_and_score_with_api', search_and_score_with_api)
+    app.run_batch(str(input_path), str(output_path), {'English': ['fraud']}, ['English'], [])
+    assert screened == ['Acme Corp', 'Globex']
+    app.run_batch(str(input_path), str(output_path), {'English': ['fraud']}, ['English'], [])
+    assert screened == ['Acme Corp', 'Globex', 'Globex']
+    records = [json.loads(line) for line in output_path.read_text(encoding='utf-8').splitlines()]
+    assert [(record['customer'], bool(record['error'])) for record in records] == [
+        ('Acme Corp', False), ('Globex', True), ('Globex', False)]
+
+
+# Screening service
+
+@pytest.fixture
+def screenings(monkeypatch):
+    """
+    Replace the pipeline with one that blocks until `release` is set; `started` lists its calls.
+    """
+    state = type('Screenings', (), {})()
+    state.started = []
+    state.release = threading.Event()
+
+    def search_and_score_with_api(name, languages_keywords, languages, excluded_sites, api_key=None, run=None, **kwargs):
+        state.started.append((name, tuple(languages)))
+        state.release.wait(5)
+        return run
+
+    monkeypatch.setattr(app, 'search_and_score_with_api', search_and_score_with_api)
+    yield state
+    state.release.set()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_service_coalesces_requests_for_the_same_screening(pipeline, screenings):
+    service = app.ScreeningService({'English': ['fraud'], 'Spanish': ['fraude']}, ['English'], [], 'key',
+                                   workers=2, queue_size=4)
+    first = service.submit('Acme Corp', ['English', 'Spanish'])
+    same = service.submit('  ACME  corp ', ['Spanish', 'English', 'Spanish'])
+    other = service.submit('Acme Corp')
+    assert same is first
+    assert other is not first
+    screenings.release.set()
+    assert first.result(timeout=5)['customer'] == 'Acme Corp'
+    assert sorted(first.result()['languages']) == ['English', 'Spanish']
+    other.result(timeout=5)
+    assert len(screenings.started) == 2
+    # Once finished, the next request screens again
+    service.submit('Acme Corp').result(timeout=5)
+    assert len(screenings.started) == 3
+
+
+def test_service_rejects_invalid_requests(pipeline, screenings):
+    service = app.ScreeningService({'English': ['fraud']}, ['English'], [], 'key', workers=1, queue_size=1)
+    with pytest.raises(ValueError):
+        service.submit('A')
+    with pytest.raises(ValueError):
+        service.submit('Acme Corp', ['Klingon'])
+
+
+def test_service_answers_503_when_the_queue_is_full(pipeline, screenings):
+    service = app.ScreeningService({'English': ['fraud']}, ['English'], [], 'key', workers=1, queue_size=1)
+    httpd = app.ThreadingHTTPServer(('127.0.0.1', 0), app.ServiceRequestHandler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    url = f'http://127.0.0.1:{httpd.server_address[1]}'
+
+    def post(customer):
+        request = urllib.request.Request(url + '/screen', data=json.dumps({'customer': customer}).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, response.headers, json.load(response)
+        except urllib.error.HTTPError as e:
+            with e:
+                return e.code, e.headers, json.load(e)
+
+    try:
+        running = service.submit('Acme Corp')
+        wait_until(lambda: service.status()['running'] == 1)
+        queued = service.submit('Globex')
+        status, headers, body = post('Initech')
+        assert (status, headers['Retry-After']) == (503, '5')
+        assert 'queue is full' in body['error']
+        assert post('A')[0] == 400
+        screenings.release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        status, _, body = post('Initech')
+        assert (status, body['customer']) == (200, 'Initech')
+        assert [name for name, _ in screenings.started] == ['Acme Corp', 'Globex', 'Initech']
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+